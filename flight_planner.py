@@ -7,13 +7,96 @@ Generates optimal flight paths for configurable drone platforms
 import json
 import math
 import os
+import functools
 from dataclasses import dataclass
 from typing import List, Tuple, Dict, Optional
 import argparse
 from datetime import datetime
 from pathlib import Path
 
-@dataclass
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Fall back to the standard library json module
+
+try:
+    import numba
+except ImportError:
+    numba = None  # Fall back to the NumPy distance/split path
+
+EARTH_RADIUS_M = 6371000  # Earth radius in meters
+SCALAR_DISTANCE_MAX_POINTS = 16  # Below this, scalar math is faster than NumPy
+
+METERS_PER_DEGREE_LAT = 111320.0  # meters per degree latitude
+
+PROFILES_FILE = Path(__file__).parent / "drone_profiles.json"
+
+@functools.lru_cache(maxsize=1)
+def _load_profiles() -> Optional[Dict]:
+    """Parse drone_profiles.json once per process (None if missing)"""
+    if not PROFILES_FILE.exists():
+        return None
+
+    if orjson is not None:
+        return orjson.loads(PROFILES_FILE.read_bytes())
+
+    with open(PROFILES_FILE, 'r') as f:
+        return json.load(f)
+
+@functools.lru_cache(maxsize=64)
+def _meters_per_degree(lat: float) -> Tuple[float, float]:
+    return METERS_PER_DEGREE_LAT, METERS_PER_DEGREE_LAT * math.cos(math.radians(lat))
+
+def meters_per_degree(lat: float) -> Tuple[float, float]:
+    """
+    Meters per degree of (latitude, longitude) at the given latitude
+    Approximate for small areas; memoized on latitude rounded to ~10 m
+    """
+    return _meters_per_degree(round(lat, 4))
+
+def _distances_and_splits(lat, lon, radius, cruise_speed, photo_time, takeoff_time, landing_time, max_time):
+    """
+    Segment distances and greedy battery split in a single pass
+    Returns (distances between consecutive waypoints, index of each flight's first waypoint)
+    """
+    n = len(lat)
+    distances = np.zeros(max(n - 1, 0))
+    flight_starts = np.zeros(max(n, 1), dtype=np.int64)
+    if n == 0:
+        return distances, flight_starts[:0]
+
+    num_flights = 1
+    elapsed = takeoff_time + photo_time
+    phi_prev = math.radians(lat[0])
+    lam_prev = math.radians(lon[0])
+
+    for i in range(1, n):
+        phi_cur = math.radians(lat[i])
+        lam_cur = math.radians(lon[i])
+
+        # Equirectangular approximation (mm-accurate over grid spacings)
+        distance = radius * math.hypot(phi_cur - phi_prev,
+                                       math.cos(0.5 * (phi_prev + phi_cur)) * (lam_cur - lam_prev))
+        distances[i-1] = distance
+
+        segment_time = distance / cruise_speed + photo_time
+        if elapsed + segment_time + landing_time > max_time:
+            flight_starts[num_flights] = i
+            num_flights += 1
+            elapsed = takeoff_time + photo_time
+        else:
+            elapsed += segment_time
+
+        phi_prev, lam_prev = phi_cur, lam_cur
+
+    return distances, flight_starts[:num_flights]
+
+if numba is not None:
+    _distances_and_splits = numba.njit(fastmath=True, cache=True)(_distances_and_splits)
+
+@dataclass(slots=True)
 class DroneSpecs:
     """Configurable drone specifications"""
     name: str = "Generic Drone"
@@ -29,15 +112,12 @@ class DroneSpecs:
     @classmethod
     def from_profile(cls, profile_name: str = None) -> 'DroneSpecs':
         """Load drone specs from profiles JSON file"""
-        profiles_file = Path(__file__).parent / "drone_profiles.json"
+        data = _load_profiles()
 
-        if not profiles_file.exists():
+        if data is None:
             print(f"Warning: drone_profiles.json not found, using default specs")
             return cls()
 
-        with open(profiles_file, 'r') as f:
-            data = json.load(f)
-
         # Use specified profile or default
         if profile_name is None:
             profile_name = data.get('default_profile', 'potensic_atom_2')
@@ -63,17 +143,59 @@ class DroneSpecs:
     @classmethod
     def list_available_profiles(cls) -> List[str]:
         """List all available drone profiles"""
-        profiles_file = Path(__file__).parent / "drone_profiles.json"
+        data = _load_profiles()
 
-        if not profiles_file.exists():
+        if data is None:
             return []
 
-        with open(profiles_file, 'r') as f:
-            data = json.load(f)
-
         return list(data['profiles'].keys())
 
-@dataclass
+@dataclass(slots=True)
+class WaypointArray:
+    """Waypoints stored as parallel arrays; dicts are only built for export"""
+    lat: np.ndarray
+    lon: np.ndarray
+    ids: np.ndarray
+    line: np.ndarray
+    point: np.ndarray
+    altitude: float = 70  # meters
+    gimbal_angle: float = -90  # degrees
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    def __getitem__(self, index: slice) -> 'WaypointArray':
+        """Slice into a contiguous run of waypoints (shares the underlying arrays)"""
+        return WaypointArray(
+            lat=self.lat[index],
+            lon=self.lon[index],
+            ids=self.ids[index],
+            line=self.line[index],
+            point=self.point[index],
+            altitude=self.altitude,
+            gimbal_angle=self.gimbal_angle
+        )
+
+    def to_dicts(self) -> List[Dict]:
+        """Expand into per-waypoint dicts for JSON export"""
+        return [
+            {
+                "id": waypoint_id,
+                "latitude": lat,
+                "longitude": lon,
+                "altitude": self.altitude,
+                "gimbal_angle": self.gimbal_angle,
+                "action": "photo",
+                "line": line,
+                "point": point
+            }
+            for waypoint_id, lat, lon, line, point in zip(
+                self.ids.tolist(), self.lat.tolist(), self.lon.tolist(),
+                self.line.tolist(), self.point.tolist()
+            )
+        ]
+
+@dataclass(slots=True)
 class MappingParams:
     """Parameters for mapping mission"""
     altitude: float = 70  # meters
@@ -86,45 +208,45 @@ class FlightPlanner:
         self.drone = drone_specs
         self.params = mapping_params
 
+        # Camera geometry depends only on the drone and mapping params, so
+        # derive it once per planner
+        # GSD = (sensor_width * altitude * 100) / (focal_length * image_width)
+        self._gsd = (self.drone.camera_sensor_width * self.params.altitude * 100) / \
+                    (self.drone.focal_length * self.drone.image_width)
+
+        gsd_meters = self._gsd / 100
+        self._footprint = (self.drone.image_width * gsd_meters,
+                           self.drone.image_height * gsd_meters)
+
+        # Calculate spacing based on overlap percentages
+        width, height = self._footprint
+        self._spacing = (height * (1 - self.params.forward_overlap / 100),
+                         width * (1 - self.params.side_overlap / 100))
+
     def calculate_gsd(self) -> float:
         """Calculate Ground Sample Distance (cm/pixel)"""
-        # GSD = (sensor_width * altitude * 100) / (focal_length * image_width)
-        gsd = (self.drone.camera_sensor_width * self.params.altitude * 100) / \
-               (self.drone.focal_length * self.drone.image_width)
-        return gsd
+        return self._gsd
 
     def calculate_footprint(self) -> Tuple[float, float]:
         """Calculate image footprint on ground (meters)"""
-        gsd_meters = self.calculate_gsd() / 100
-        width = self.drone.image_width * gsd_meters
-        height = self.drone.image_height * gsd_meters
-        return width, height
+        return self._footprint
 
     def calculate_spacing(self) -> Tuple[float, float]:
         """Calculate spacing between photo positions"""
-        width, height = self.calculate_footprint()
-
-        # Calculate spacing based on overlap percentages
-        forward_spacing = height * (1 - self.params.forward_overlap / 100)
-        side_spacing = width * (1 - self.params.side_overlap / 100)
+        return self._spacing
 
-        return forward_spacing, side_spacing
-
-    def generate_grid_pattern(self, boundary_coords: List[Tuple[float, float]]) -> List[Dict]:
+    def generate_grid_pattern(self, boundary_coords: List[Tuple[float, float]]) -> WaypointArray:
         """
         Generate grid flight pattern for given boundary
         boundary_coords: List of (lat, lon) tuples defining area boundary
         """
         # Find bounding box
-        lats = [coord[0] for coord in boundary_coords]
-        lons = [coord[1] for coord in boundary_coords]
-
-        min_lat, max_lat = min(lats), max(lats)
-        min_lon, max_lon = min(lons), max(lons)
+        coords = np.asarray(boundary_coords, dtype=np.float64)
+        min_lat, min_lon = coords.min(axis=0).tolist()
+        max_lat, max_lon = coords.max(axis=0).tolist()
 
         # Convert to meters (approximate for small areas)
-        lat_to_meters = 111320.0  # meters per degree latitude
-        lon_to_meters = lat_to_meters * math.cos(math.radians((min_lat + max_lat) / 2))
+        lat_to_meters, lon_to_meters = meters_per_degree((min_lat + max_lat) / 2)
 
         area_width = (max_lon - min_lon) * lon_to_meters
         area_height = (max_lat - min_lat) * lat_to_meters
@@ -135,75 +257,75 @@ class FlightPlanner:
         num_lines = int(math.ceil(area_width / side_spacing)) + 1
         points_per_line = int(math.ceil(area_height / forward_spacing)) + 1
 
-        waypoints = []
-        line_direction = 1  # Alternate direction for efficiency
-
-        for line_idx in range(num_lines):
-            lon_offset = (line_idx * side_spacing) / lon_to_meters
-            current_lon = min_lon + lon_offset
-
-            if line_direction == 1:
-                # Fly north
-                for point_idx in range(points_per_line):
-                    lat_offset = (point_idx * forward_spacing) / lat_to_meters
-                    current_lat = min_lat + lat_offset
-
-                    waypoint = {
-                        "id": len(waypoints) + 1,
-                        "latitude": current_lat,
-                        "longitude": current_lon,
-                        "altitude": self.params.altitude,
-                        "gimbal_angle": self.params.gimbal_angle,
-                        "action": "photo",
-                        "line": line_idx + 1,
-                        "point": point_idx + 1
-                    }
-                    waypoints.append(waypoint)
-            else:
-                # Fly south (reverse order for snake pattern)
-                for point_idx in range(points_per_line - 1, -1, -1):
-                    lat_offset = (point_idx * forward_spacing) / lat_to_meters
-                    current_lat = min_lat + lat_offset
-
-                    waypoint = {
-                        "id": len(waypoints) + 1,
-                        "latitude": current_lat,
-                        "longitude": current_lon,
-                        "altitude": self.params.altitude,
-                        "gimbal_angle": self.params.gimbal_angle,
-                        "action": "photo",
-                        "line": line_idx + 1,
-                        "point": point_idx + 1
-                    }
-                    waypoints.append(waypoint)
-
-            line_direction *= -1  # Alternate direction
-
-        return waypoints
-
-    def estimate_mission_time(self, waypoints: List[Dict]) -> Dict:
-        """Estimate total mission time and battery requirements"""
-        if not waypoints:
-            return {"error": "No waypoints provided"}
+        # Per-line longitudes and per-point latitudes, broadcast to the full grid
+        i = np.arange(num_lines)[:, None]
+        j = np.arange(points_per_line)[None, :]
+        shape = (num_lines, points_per_line)
+
+        lon = np.broadcast_to(min_lon + i * side_spacing / lon_to_meters, shape)
+        lat = np.broadcast_to(min_lat + j * forward_spacing / lat_to_meters, shape).copy()
+        point_idx = np.broadcast_to(j.astype(np.int32) + 1, shape).copy()
+
+        # Reverse odd lines for an efficient snake pattern
+        lat[1::2] = lat[1::2, ::-1]
+        point_idx[1::2] = point_idx[1::2, ::-1]
+
+        return WaypointArray(
+            lat=lat.ravel(),
+            lon=lon.ravel(),
+            ids=np.arange(1, num_lines * points_per_line + 1, dtype=np.int32),
+            line=np.repeat(np.arange(1, num_lines + 1, dtype=np.int32), points_per_line),
+            point=point_idx.ravel(),
+            altitude=self.params.altitude,
+            gimbal_angle=self.params.gimbal_angle
+        )
+
+    def _segment_distances(self, waypoints: WaypointArray) -> np.ndarray:
+        """
+        Distance (meters) between each pair of consecutive waypoints
+        Grid segments are a few meters to a few hundred meters long, so the
+        equirectangular approximation stands in for the full Haversine formula
+        """
+        if len(waypoints) <= SCALAR_DISTANCE_MAX_POINTS:
+            # Short lists: plain math beats NumPy call overhead. Each endpoint
+            # is converted once and reused as the start of the next segment
+            distances = np.zeros(max(len(waypoints) - 1, 0))
+            if not len(waypoints):
+                return distances
 
-        total_distance = 0
+            lats, lons = waypoints.lat.tolist(), waypoints.lon.tolist()
+            phi_prev = math.radians(lats[0])
+            lam_prev = math.radians(lons[0])
 
-        # Calculate distance between consecutive waypoints
-        for i in range(1, len(waypoints)):
-            lat1, lon1 = waypoints[i-1]["latitude"], waypoints[i-1]["longitude"]
-            lat2, lon2 = waypoints[i]["latitude"], waypoints[i]["longitude"]
+            for i in range(1, len(lats)):
+                phi_cur = math.radians(lats[i])
+                lam_cur = math.radians(lons[i])
 
-            # Haversine formula for distance
-            R = 6371000  # Earth radius in meters
-            phi1, phi2 = math.radians(lat1), math.radians(lat2)
-            delta_phi = math.radians(lat2 - lat1)
-            delta_lambda = math.radians(lon2 - lon1)
+                distances[i-1] = EARTH_RADIUS_M * math.hypot(
+                    phi_cur - phi_prev,
+                    math.cos(0.5 * (phi_prev + phi_cur)) * (lam_cur - lam_prev))
+
+                phi_prev, lam_prev = phi_cur, lam_cur
+            return distances
+
+        if numba is not None:
+            distances, _ = _distances_and_splits(waypoints.lat, waypoints.lon, EARTH_RADIUS_M,
+                                                 self.drone.cruise_speed, 0.0, 0.0, 0.0, math.inf)
+            return distances
+
+        # Vectorized equirectangular distance over all consecutive waypoint pairs
+        phi = np.radians(waypoints.lat)
+        delta_phi = np.diff(phi)
+        delta_lambda = np.diff(np.radians(waypoints.lon))
+
+        return EARTH_RADIUS_M * np.hypot(delta_phi, np.cos(0.5 * (phi[:-1] + phi[1:])) * delta_lambda)
+
+    def estimate_mission_time(self, waypoints: WaypointArray) -> Dict:
+        """Estimate total mission time and battery requirements"""
+        if not waypoints:
+            return {"error": "No waypoints provided"}
 
-            a = math.sin(delta_phi/2)**2 + \
-                math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda/2)**2
-            c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-            distance = R * c
-            total_distance += distance
+        total_distance = float(self._segment_distances(waypoints).sum())
 
         # Add takeoff and landing altitude
         total_distance += 2 * self.params.altitude
@@ -225,128 +347,100 @@ class FlightPlanner:
             "total_time_min": round(total_time_minutes, 2),
             "batteries_needed": batteries_needed,
             "estimated_photos": len(waypoints),
-            "gsd_cm_per_pixel": round(self.calculate_gsd(), 2),
-            "coverage_per_photo_m2": round(self.calculate_footprint()[0] *
-                                          self.calculate_footprint()[1], 2)
+            "gsd_cm_per_pixel": round(self._gsd, 2),
+            "coverage_per_photo_m2": round(self._footprint[0] * self._footprint[1], 2)
         }
 
-    def split_into_flights(self, waypoints: List[Dict],
-                          battery_safety_margin: float = 0.8) -> List[List[Dict]]:
+    def split_into_flights(self, waypoints: WaypointArray,
+                          battery_safety_margin: float = 0.8) -> List[WaypointArray]:
         """Split waypoints into multiple flights based on battery capacity"""
         max_flight_seconds = self.drone.max_flight_time * 60 * battery_safety_margin
 
-        flights = []
-        current_flight = []
-        current_time = 0
-        last_position = None
-
-        for waypoint in waypoints:
-            # Calculate time to reach this waypoint
-            if last_position:
-                lat1, lon1 = last_position["latitude"], last_position["longitude"]
-                lat2, lon2 = waypoint["latitude"], waypoint["longitude"]
-
-                # Calculate distance (simplified)
-                R = 6371000
-                phi1, phi2 = math.radians(lat1), math.radians(lat2)
-                delta_phi = math.radians(lat2 - lat1)
-                delta_lambda = math.radians(lon2 - lon1)
-
-                a = math.sin(delta_phi/2)**2 + \
-                    math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda/2)**2
-                c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-                distance = R * c
-
-                travel_time = distance / self.drone.cruise_speed
-            else:
-                travel_time = self.params.altitude / self.drone.cruise_speed  # Takeoff
-
-            photo_time = 2  # seconds per photo
-            segment_time = travel_time + photo_time
-
-            # Check if adding this waypoint exceeds battery capacity
-            if current_time + segment_time + (self.params.altitude / self.drone.cruise_speed) > max_flight_seconds:
-                # Start new flight
-                if current_flight:
-                    flights.append(current_flight)
-                current_flight = [waypoint]
-                current_time = self.params.altitude / self.drone.cruise_speed + photo_time
-            else:
-                current_flight.append(waypoint)
-                current_time += segment_time
-
-            last_position = waypoint
-
-        if current_flight:
-            flights.append(current_flight)
+        takeoff_time = self.params.altitude / self.drone.cruise_speed
+        landing_time = takeoff_time
+        photo_time = 2  # seconds per photo
 
-        return flights
+        if numba is not None:
+            _, flight_starts = _distances_and_splits(waypoints.lat, waypoints.lon, EARTH_RADIUS_M,
+                                                     self.drone.cruise_speed, photo_time,
+                                                     takeoff_time, landing_time, max_flight_seconds)
+            flight_starts = flight_starts.tolist()
+            flight_ends = flight_starts[1:] + [len(waypoints)]
+            return [waypoints[start:end] for start, end in zip(flight_starts, flight_ends)]
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Generate flight plan for drone mapping",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  # List available drone profiles
-  python flight_planner.py --list-drones
+        # Time to reach and photograph each waypoint from the previous one
+        segment_times = self._segment_distances(waypoints) / self.drone.cruise_speed + photo_time
 
-  # Generate plan with specific drone
-  python flight_planner.py --drone dji_mini_3_pro --center-lat 40.7128 --center-lon -74.0060
-
-  # Custom area size
-  python flight_planner.py --area-size 800 --center-lat 40.7128 --center-lon -74.0060
-        """
-    )
-    parser.add_argument("--drone", type=str, default=None,
-                       help="Drone profile name (see --list-drones)")
-    parser.add_argument("--list-drones", action="store_true",
-                       help="List available drone profiles")
-    parser.add_argument("--area-size", type=float, default=500,
-                       help="Approximate area size in meters (square)")
-    parser.add_argument("--center-lat", type=float, default=40.7128,
-                       help="Center latitude of mapping area")
-    parser.add_argument("--center-lon", type=float, default=-74.0060,
-                       help="Center longitude of mapping area")
-    parser.add_argument("--altitude", type=float, default=70,
-                       help="Flight altitude in meters")
-    parser.add_argument("--output", type=str, default="flight_plan.json",
-                       help="Output file for flight plan")
-
-    args = parser.parse_args()
+        flights = []
+        start = 0
+        while start < len(waypoints):
+            # Every flight begins with a takeoff to its first waypoint; the
+            # remaining waypoints accumulate as a prefix sum of segment times
+            flight_times = np.empty(len(waypoints) - start)
+            flight_times[0] = takeoff_time + photo_time
+            flight_times[1:] = segment_times[start:]
+            cumulative = np.cumsum(flight_times) + landing_time
+
+            # Waypoints that still fit in this battery (always at least one)
+            count = max(1, int(np.searchsorted(cumulative, max_flight_seconds, side='right')))
+            flights.append(waypoints[start:start + count])
+            start += count
 
-    # List drones if requested
-    if args.list_drones:
-        profiles = DroneSpecs.list_available_profiles()
-        print("\nAvailable Drone Profiles:")
-        print("=" * 50)
-        for profile_name in profiles:
-            drone = DroneSpecs.from_profile(profile_name)
-            print(f"\n{profile_name}")
-            print(f"  Name: {drone.name}")
-            print(f"  Resolution: {drone.image_width}x{drone.image_height} ({drone.image_width * drone.image_height // 1000000}MP)")
-            print(f"  Flight Time: {drone.max_flight_time} min")
-            print(f"  Cruise Speed: {drone.cruise_speed} m/s")
-        print("\n" + "=" * 50)
-        return
+        return flights
 
+def _json_bytes(value) -> bytes:
+    """Serialize a single JSON value (compact)"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value).encode('utf-8')
+
+def write_flight_plan(output_path: str, header: Dict, waypoints: WaypointArray,
+                      flights: List[Dict], chunk_size: int = 1024):
+    """
+    Stream the flight plan JSON to disk
+    Waypoint dicts are built one chunk at a time, so the full waypoint list
+    is never held in memory alongside the serialized output
+    """
+    with open(output_path, 'wb') as f:
+        f.write(b'{')
+        for key, value in header.items():
+            f.write(b'\n  ' + _json_bytes(key) + b': ' + _json_bytes(value) + b',')
+
+        f.write(b'\n  "waypoints": [')
+        separator = b'\n    '
+        for start in range(0, len(waypoints), chunk_size):
+            for waypoint in waypoints[start:start + chunk_size].to_dicts():
+                f.write(separator + _json_bytes(waypoint))
+                separator = b',\n    '
+
+        f.write(b'\n  ],\n  "flights": [')
+        separator = b'\n    '
+        for flight in flights:
+            f.write(separator + _json_bytes(flight))
+            separator = b',\n    '
+        f.write(b'\n  ]\n}\n')
+
+def plan_mission(drone_name: Optional[str], center_lat: float, center_lon: float,
+                 area_size: float, altitude: float, output: str) -> Dict:
+    """Plan a square mapping mission around a center point, save it and print a summary"""
     # Initialize planner with selected drone
-    drone = DroneSpecs.from_profile(args.drone)
-    params = MappingParams(altitude=args.altitude)
+    drone = DroneSpecs.from_profile(drone_name)
+    params = MappingParams(altitude=altitude)
     planner = FlightPlanner(drone, params)
 
     print(f"\n🚁 Using drone: {drone.name}")
 
     # Generate boundary (square around center point)
-    half_size = args.area_size / 2
-    lat_offset = half_size / 111320.0
-    lon_offset = half_size / (111320.0 * math.cos(math.radians(args.center_lat)))
+    half_size = area_size / 2
+    lat_to_meters, lon_to_meters = meters_per_degree(center_lat)
+    lat_offset = half_size / lat_to_meters
+    lon_offset = half_size / lon_to_meters
 
     boundary = [
-        (args.center_lat - lat_offset, args.center_lon - lon_offset),
-        (args.center_lat - lat_offset, args.center_lon + lon_offset),
-        (args.center_lat + lat_offset, args.center_lon + lon_offset),
-        (args.center_lat + lat_offset, args.center_lon - lon_offset),
+        (center_lat - lat_offset, center_lon - lon_offset),
+        (center_lat - lat_offset, center_lon + lon_offset),
+        (center_lat + lat_offset, center_lon + lon_offset),
+        (center_lat + lat_offset, center_lon - lon_offset),
     ]
 
     # Generate waypoints
@@ -355,14 +449,18 @@ Examples:
     # Estimate mission parameters
     mission_stats = planner.estimate_mission_time(waypoints)
 
-    # Split into flights if needed
-    flights = planner.split_into_flights(waypoints)
+    # Split into flights if needed (the estimate uses the same battery margin)
+    if mission_stats["batteries_needed"] <= 1:
+        flights = [waypoints]
+    else:
+        flights = planner.split_into_flights(waypoints)
 
     # Prepare output
-    output = {
-        "mission_name": f"Mapping_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+    now = datetime.now()
+    header = {
+        "mission_name": "Mapping_" + now.strftime('%Y%m%d_%H%M%S'),
         "drone": drone.name,
-        "creation_date": datetime.now().isoformat(),
+        "creation_date": now.isoformat(),
         "parameters": {
             "altitude_m": params.altitude,
             "forward_overlap_percent": params.forward_overlap,
@@ -371,24 +469,26 @@ Examples:
         },
         "statistics": mission_stats,
         "boundary_coords": boundary,
-        "total_flights": len(flights),
-        "flights": [
-            {
-                "flight_number": i + 1,
-                "waypoints": flight,
-                "waypoint_count": len(flight)
-            }
-            for i, flight in enumerate(flights)
-        ]
+        "total_flights": len(flights)
     }
 
+    # Flights reference [start, end) ranges of the shared waypoint list
+    flight_records = []
+    flight_start = 0
+    for i, flight in enumerate(flights):
+        flight_records.append({
+            "flight_number": i + 1,
+            "waypoint_index_range": [flight_start, flight_start + len(flight)],
+            "waypoint_count": len(flight)
+        })
+        flight_start += len(flight)
+
     # Save to file
-    with open(args.output, 'w') as f:
-        json.dump(output, f, indent=2)
+    write_flight_plan(output, header, waypoints, flight_records)
 
     # Print summary
     print(f"\n=== Flight Plan Generated ===")
-    print(f"Output saved to: {args.output}")
+    print(f"Output saved to: {output}")
     print(f"\nMission Statistics:")
     print(f"  Total waypoints: {mission_stats['total_waypoints']}")
     print(f"  Total distance: {mission_stats['total_distance_m']:.0f} meters")
@@ -403,5 +503,58 @@ Examples:
         for i, flight in enumerate(flights, 1):
             print(f"  Flight {i}: {len(flight)} waypoints")
 
+    return header
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Generate flight plan for drone mapping",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # List available drone profiles
+  python flight_planner.py --list-drones
+
+  # Generate plan with specific drone
+  python flight_planner.py --drone dji_mini_3_pro --center-lat 40.7128 --center-lon -74.0060
+
+  # Custom area size
+  python flight_planner.py --area-size 800 --center-lat 40.7128 --center-lon -74.0060
+        """
+    )
+    parser.add_argument("--drone", type=str, default=None,
+                       help="Drone profile name (see --list-drones)")
+    parser.add_argument("--list-drones", action="store_true",
+                       help="List available drone profiles")
+    parser.add_argument("--area-size", type=float, default=500,
+                       help="Approximate area size in meters (square)")
+    parser.add_argument("--center-lat", type=float, default=40.7128,
+                       help="Center latitude of mapping area")
+    parser.add_argument("--center-lon", type=float, default=-74.0060,
+                       help="Center longitude of mapping area")
+    parser.add_argument("--altitude", type=float, default=70,
+                       help="Flight altitude in meters")
+    parser.add_argument("--output", type=str, default="flight_plan.json",
+                       help="Output file for flight plan")
+
+    args = parser.parse_args(argv)
+
+    # List drones if requested
+    if args.list_drones:
+        profiles = DroneSpecs.list_available_profiles()
+        print("\nAvailable Drone Profiles:")
+        print("=" * 50)
+        for profile_name in profiles:
+            drone = DroneSpecs.from_profile(profile_name)
+            print(f"\n{profile_name}")
+            print(f"  Name: {drone.name}")
+            print(f"  Resolution: {drone.image_width}x{drone.image_height} ({drone.image_width * drone.image_height // 1000000}MP)")
+            print(f"  Flight Time: {drone.max_flight_time} min")
+            print(f"  Cruise Speed: {drone.cruise_speed} m/s")
+        print("\n" + "=" * 50)
+        return
+
+    plan_mission(args.drone, args.center_lat, args.center_lon,
+                 args.area_size, args.altitude, args.output)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
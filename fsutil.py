@@ -0,0 +1,63 @@
+"""
+Filesystem helpers shared by the processing scripts
+Kept free of third-party imports so small tools can use them cheaply
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Linux ioctl that makes dst a copy-on-write clone of src (Btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+def fast_copy(src: Path, dst: Path, link: bool = True) -> str:
+    """
+    Hardlink, reflink or copy src to dst, cheapest option first; returns the method used
+    With link=False dst never shares an inode with src, so rewriting src
+    in place later cannot change dst
+    """
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+
+    if link:
+        try:
+            os.link(src, dst)
+            return 'linked'
+        except OSError:
+            pass
+
+    if fcntl is not None:
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return 'reflinked'
+        except OSError:
+            pass
+
+    # Across filesystems, copy_file_range keeps the copy in the kernel
+    # (and lets NFS/SMB copy server-side) instead of a userspace loop
+    if hasattr(os, 'copy_file_range'):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                shutil.copystat(src, dst)
+                return 'copied'
+        except OSError:
+            pass
+
+    shutil.copy2(src, dst)
+    return 'copied'
@@ -4,110 +4,609 @@ Image Processing Pipeline for Drone Mapping
 Processes drone photos into orthomosaics and 3D models
 """
 
+import base64
+import functools
+import gzip
+import hashlib
+import io
+import math
+import mmap
 import os
+import re
 import json
 import shutil
+import struct
 import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import argparse
 from datetime import datetime
-import exifread
+import numpy as np
 import piexif
 
+from fsutil import fast_copy
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Fall back to the standard library json module
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # Web package ships gzip-only precompressed assets
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None  # Fall back to the precompiled regexes
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None  # Tiles stay PNG without Pillow
+
+try:
+    import rasterio
+    import rasterio.warp
+except ImportError:
+    rasterio = None
+
+# JPEG EXIF is located by walking the segment chain; other formats (TIFF,
+# PNG) hand exifread this much of the file before a full-file fallback
+EXIF_HEADER_BYTES = 64 * 1024
+
+# Above this many images, hand EXIF parsing to exiftool (when installed) in
+# a few batched invocations instead of parsing each file in Python
+EXIFTOOL_BATCH_MIN_IMAGES = 500
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.tif', '.tiff')
+
+# Below this many images, EXIF is parsed inline: each parse is tens of
+# microseconds, less than starting (and importing into) worker processes
+EXIF_POOL_MIN_IMAGES = 64
+
+# Bytes hashed (with the file size) to spot the same photo uploaded twice
+DEDUPE_HEADER_BYTES = 4096
+
+TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+
+@functools.lru_cache(maxsize=None)
+def _load_template(name: str) -> str:
+    """Read a template once, inlining any /*__INCLUDE:file__*/ markers"""
+    text = (TEMPLATES_DIR / name).read_text(encoding='utf-8')
+    return re.sub(r'/\*__INCLUDE:([\w.]+)__\*/\n?', lambda m: _load_template(m.group(1)), text)
+
+@functools.lru_cache(maxsize=None)
+def _split_template(name: str) -> tuple:
+    """Split a template once around its /*__CONFIG__*/{} placeholder"""
+    head, sep, tail = _load_template(name).partition('/*__CONFIG__*/{}')
+    if not sep:
+        raise ValueError(f"Template {name} has no /*__CONFIG__*/{{}} placeholder")
+    return head, tail
+
+def _render_template(name: str, config: Dict) -> str:
+    """Fill a template's /*__CONFIG__*/ placeholder with a JSON payload"""
+    head, tail = _split_template(name)
+    payload = _json_bytes(config).decode('utf-8').replace('</', '<\\/')
+    return head + payload + tail
+
+def _json_bytes(value) -> bytes:
+    """Serialize a single JSON value (compact, NumPy arrays allowed)"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value, default=lambda obj: obj.tolist()).encode('utf-8')
+
+def _json_loads(data: bytes):
+    """Parse JSON bytes with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _write_precompressed(path: Path, data: bytes):
+    """Write data plus .gz (and .br when brotli is installed) siblings for static hosts"""
+    path.write_bytes(data)
+    path.with_name(path.name + '.gz').write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        path.with_name(path.name + '.br').write_bytes(brotli.compress(data, quality=11))
+
 class ImageProcessor:
-    def __init__(self, input_dir: str, output_dir: str):
-        self.input_dir = Path(input_dir)
+    def __init__(self, input_dir: Optional[str], output_dir: str, jobs: int = None, cog: bool = False,
+                 frame_size: Optional[Tuple[int, int]] = None):
+        # Construction only records paths; directories are created by
+        # prepare_images so read-only commands stay cheap
+        self.input_dir = Path(input_dir) if input_dir is not None else None
         self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.jobs = jobs or os.cpu_count() or 1
+        self.cog = cog  # Publish a Cloud-Optimized GeoTIFF instead of a tile pyramid
+        self.frame_size = frame_size  # Only JPEGs of this (width, height) go to ODM
 
-        # Create subdirectories
+        # Subdirectories
         self.processed_dir = self.output_dir / "processed_images"
+        self.manifest_file = self.processed_dir / "manifest.json"
+        self.exif_cache_file = self.processed_dir / "exif_cache.json"
         self.georef_dir = self.output_dir / "georeferenced"
         self.ortho_dir = self.output_dir / "orthomosaic"
         self.report_dir = self.output_dir / "reports"
 
-        for dir in [self.processed_dir, self.georef_dir,
-                   self.ortho_dir, self.report_dir]:
-            dir.mkdir(parents=True, exist_ok=True)
-
         # Progress tracking
         self.progress_file = self.output_dir / "processing_progress.json"
+        self._progress = None
+        self._progress_dirty = False
+        self._completed_stages = set()
+        self._image_count = None
         self.odm_stages = [
             'dataset', 'opensfm', 'mve', 'odm_filterpoints', 'odm_meshing',
             'mvs_texturing', 'odm_georeferencing', 'odm_dem', 'odm_orthophoto'
         ]
 
-    def extract_gps_from_exif(self, image_path: str) -> Optional[Dict]:
-        """Extract GPS coordinates from image EXIF data"""
-        try:
-            with open(image_path, 'rb') as f:
-                tags = exifread.process_file(f)
+        # Stage weights (approximate time percentages)
+        self.stage_weights = {
+            'dataset': 5,
+            'opensfm': 40,  # Feature detection/matching - longest stage
+            'mve': 10,
+            'odm_filterpoints': 5,
+            'odm_meshing': 10,
+            'mvs_texturing': 10,
+            'odm_georeferencing': 5,
+            'odm_dem': 10,
+            'odm_orthophoto': 5
+        }
+        self._total_stage_weight = sum(self.stage_weights.values())
+
+        # Log-line matchers for the ODM output loop, compiled once
+        self._stage_re = re.compile(
+            r'(?P<stage>' + '|'.join(map(re.escape, self.odm_stages)) + r')', re.IGNORECASE)
+        self._progress_re = re.compile(
+            r'detect_features|extracting features|match_features|matching features|'
+            r'reconstruction|reconstructing|completed|finished', re.IGNORECASE)
+        self._progress_markers = {
+            'detect_features': 0.2, 'extracting features': 0.2,
+            'match_features': 0.5, 'matching features': 0.5,
+            'reconstruction': 0.7, 'reconstructing': 0.7,
+            'completed': 1.0, 'finished': 1.0
+        }
 
-            # Extract GPS data
-            gps_data = {}
-            gps_keys = ['GPS GPSLatitude', 'GPS GPSLatitudeRef',
-                       'GPS GPSLongitude', 'GPS GPSLongitudeRef',
-                       'GPS GPSAltitude', 'GPS GPSAltitudeRef']
+    @classmethod
+    def for_output(cls, output_dir: str, **kwargs) -> 'ImageProcessor':
+        """Processor for commands that only read or extend an existing output dir"""
+        return cls(None, output_dir, **kwargs)
 
-            for key in gps_keys:
-                if key in tags:
-                    gps_data[key] = tags[key]
+    def _make_output_dirs(self):
+        """Create the output subdirectories used by the full pipeline"""
+        for dir in [self.processed_dir, self.georef_dir,
+                   self.ortho_dir, self.report_dir]:
+            dir.mkdir(parents=True, exist_ok=True)
 
-            if not gps_data:
-                return None
+    @functools.cached_property
+    def mission_name(self) -> str:
+        """Mission name shown in the viewers, taken from the output directory"""
+        return self.output_dir.parent.name if self.output_dir.parent.name != 'outputs' else 'Orthomosaic'
+
+    @functools.cached_property
+    def tile_ext(self) -> str:
+        """Tile format: WebP when Pillow can encode it, otherwise PNG"""
+        return '.webp' if Image is not None and features.check('webp') else '.png'
+
+    @functools.cached_property
+    def _magick_path(self) -> Optional[str]:
+        """ImageMagick 7 'magick' binary, looked up on PATH once"""
+        return shutil.which('magick')
+
+    @functools.cached_property
+    def _aho(self):
+        """With pyahocorasick, one automaton finds stage names and progress
+        markers in a single pass over the lowercased line"""
+        if ahocorasick is None:
+            return None
+        aho = ahocorasick.Automaton()
+        for stage in self.odm_stages:
+            aho.add_word(stage, ('stage', stage))
+        for marker in self._progress_markers:
+            aho.add_word(marker, ('progress', marker))
+        aho.make_automaton()
+        return aho
+
+    @staticmethod
+    def _gps_from_app1(header: bytes) -> Optional[tuple]:
+        """Read raw GPS rationals straight from the EXIF TIFF block, skipping every other IFD"""
+        start = header.find(b'Exif\x00\x00')
+        if start < 0:
+            return None
+        tiff = memoryview(header)[start + 6:]
+        order = {b'II': '<', b'MM': '>'}.get(bytes(tiff[:2]))
+        if order is None:
+            raise ValueError("bad TIFF byte order")
+
+        def ifd_fields(offset):
+            count, = struct.unpack_from(order + 'H', tiff, offset)
+            return {tag: (field_type, n, offset + 10 + 12 * i)
+                    for i, (tag, field_type, n) in enumerate(
+                        struct.iter_unpack(order + 'HHI4x', tiff[offset + 2:offset + 2 + 12 * count]))}
+
+        ifd0 = ifd_fields(struct.unpack_from(order + 'I', tiff, 4)[0])
+        if 0x8825 not in ifd0:  # GPSInfo pointer
+            return None
+        gps = ifd_fields(struct.unpack_from(order + 'I', tiff, ifd0[0x8825][2])[0])
+        if not {1, 2, 3, 4} <= gps.keys():
+            return None
 
-            # Convert GPS coordinates to decimal degrees
-            def convert_to_degrees(value):
-                d = float(value.values[0].num) / float(value.values[0].den)
-                m = float(value.values[1].num) / float(value.values[1].den)
-                s = float(value.values[2].num) / float(value.values[2].den)
-                return d + (m / 60.0) + (s / 3600.0)
-
-            lat = convert_to_degrees(gps_data['GPS GPSLatitude'])
-            if gps_data['GPS GPSLatitudeRef'].values != 'N':
-                lat = -lat
-
-            lon = convert_to_degrees(gps_data['GPS GPSLongitude'])
-            if gps_data['GPS GPSLongitudeRef'].values != 'E':
-                lon = -lon
-
-            # Extract altitude if available
-            alt = None
-            if 'GPS GPSAltitude' in gps_data:
-                alt_value = gps_data['GPS GPSAltitude'].values[0]
-                alt = float(alt_value.num) / float(alt_value.den)
-
-            return {
-                'latitude': lat,
-                'longitude': lon,
-                'altitude': alt
-            }
+        def rationals(tag):
+            _, n, value_at = gps[tag]
+            offset, = struct.unpack_from(order + 'I', tiff, value_at)
+            values = struct.unpack_from(order + f'{2 * n}I', tiff, offset)
+            return tuple(zip(values[::2], values[1::2]))
+
+        def ref(tag):
+            return chr(tiff[gps[tag][2]])
+
+        return (
+            rationals(2),
+            ref(1),
+            rationals(4),
+            ref(3),
+            rationals(6)[0] if 6 in gps else None
+        )
+
+    @staticmethod
+    def _gps_from_piexif(header: bytes) -> Optional[tuple]:
+        """Read raw GPS rationals from the JPEG header via piexif"""
+        gps = piexif.load(header)['GPS']
+        if not gps:
+            return None
+
+        return (
+            gps[piexif.GPSIFD.GPSLatitude],
+            gps[piexif.GPSIFD.GPSLatitudeRef].decode(),
+            gps[piexif.GPSIFD.GPSLongitude],
+            gps[piexif.GPSIFD.GPSLongitudeRef].decode(),
+            gps.get(piexif.GPSIFD.GPSAltitude)
+        )
+
+    @staticmethod
+    def _gps_from_exifread(f, header: bytes) -> Optional[tuple]:
+        """Read raw GPS rationals with exifread (fallback for non-JPEG or odd files)"""
+        # Imported on first use: most runs never get past the native parser
+        import exifread
+
+        if header[:2] == b'\xff\xd8':
+            # The header already runs to the end of EXIF when there is any
+            source = io.BytesIO(header)
+        else:
+            # TIFF and friends keep IFDs anywhere in the file; exifread
+            # seeks straight to them, so hand it the file itself
+            source = f
+            f.seek(0)
+        tags = exifread.process_file(source, details=False, extract_thumbnail=False,
+                                     stop_tag='GPS GPSAltitude')
+
+        lat = tags.get('GPS GPSLatitude')
+        lon = tags.get('GPS GPSLongitude')
+        if lat is None or lon is None:
+            return None
+
+        def rationals(tag):
+            return [(r.num, r.den) for r in tag.values]
+
+        alt = tags.get('GPS GPSAltitude')
+        return (
+            rationals(lat),
+            tags['GPS GPSLatitudeRef'].values,
+            rationals(lon),
+            tags['GPS GPSLongitudeRef'].values,
+            rationals(alt)[0] if alt is not None else None
+        )
+
+    @staticmethod
+    def _exif_segment_end(data) -> Optional[int]:
+        """Offset just past a JPEG's EXIF APP1 segment, or None if there is none"""
+        # Walk the segment chain (marker + big-endian length) until EXIF or
+        # the start of scan
+        pos = 2
+        while pos + 10 <= len(data) and data[pos] == 0xFF:
+            marker = data[pos + 1]
+            if marker in (0xD9, 0xDA):
+                return None
+            end = pos + 2 + struct.unpack_from('>H', data, pos + 2)[0]
+            if marker == 0xE1 and data[pos + 4:pos + 10] == b'Exif\x00\x00':
+                return end
+            pos = end
+        return None
+
+    @staticmethod
+    def _read_exif_header(f) -> bytes:
+        """Read the front of an image; for JPEGs, exactly the segments up to the end of EXIF"""
+        # Map the file instead of reading a fixed slice: only the pages the
+        # segment walk touches are faulted in, however far EXIF sits
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                end = ImageProcessor._exif_segment_end(data) if data[:2] == b'\xff\xd8' else None
+                if end is None:
+                    return data[:EXIF_HEADER_BYTES]
+                # Cut after EXIF with a start-of-scan marker so parsers never
+                # walk into a segment truncated by the slice
+                return data[:end] + b'\xff\xda'
+        except (ValueError, OSError):  # empty or unmappable file
+            return f.read(EXIF_HEADER_BYTES)
+
+    @staticmethod
+    def extract_gps_raw(image_path: str) -> Optional[tuple]:
+        """Extract raw GPS rationals and hemisphere refs from image EXIF data"""
+        try:
+            with open(image_path, 'rb') as f:
+                header = ImageProcessor._read_exif_header(f)
+                if header[:2] == b'\xff\xd8':
+                    try:
+                        return ImageProcessor._gps_from_app1(header)
+                    except (ValueError, struct.error):
+                        pass
+                    try:
+                        return ImageProcessor._gps_from_piexif(header)
+                    except (piexif.InvalidImageDataError, ValueError, struct.error):
+                        pass
+                return ImageProcessor._gps_from_exifread(f, header)
 
         except Exception as e:
             print(f"Error extracting GPS from {image_path}: {e}")
             return None
 
+    @staticmethod
+    def _is_rational(value) -> bool:
+        """True for a (numerator, denominator) pair with a nonzero denominator"""
+        try:
+            return len(value) == 2 and value[1] != 0
+        except TypeError:
+            return False
+
+    @staticmethod
+    def _is_dms(value) -> bool:
+        """True for exactly three degree/minute/second rationals"""
+        try:
+            return len(value) == 3 and all(map(ImageProcessor._is_rational, value))
+        except TypeError:
+            return False
+
+    @staticmethod
+    def decode_gps(raw_records: List[Optional[tuple]]) -> List[Optional[Dict]]:
+        """Convert raw GPS rationals to decimal degrees for all images at once"""
+        results = [None] * len(raw_records)
+        # A malformed file (ragged or zero-denominator rationals) would make
+        # the arrays below fail for every image, so it is left without GPS
+        valid = [i for i, raw in enumerate(raw_records)
+                 if raw and ImageProcessor._is_dms(raw[0]) and ImageProcessor._is_dms(raw[2])]
+        if not valid:
+            return results
+
+        records = [raw_records[i] for i in valid]
+        lat_dms = np.asarray([r[0] for r in records], dtype=np.float64)
+        lon_dms = np.asarray([r[2] for r in records], dtype=np.float64)
+        alt = np.asarray([r[4] if ImageProcessor._is_rational(r[4]) else (np.nan, 1) for r in records],
+                         dtype=np.float64)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lat_parts = lat_dms[..., 0] / lat_dms[..., 1]
+            lon_parts = lon_dms[..., 0] / lon_dms[..., 1]
+            lat = lat_parts[:, 0] + lat_parts[:, 1] / 60.0 + lat_parts[:, 2] / 3600.0
+            lon = lon_parts[:, 0] + lon_parts[:, 1] / 60.0 + lon_parts[:, 2] / 3600.0
+            alt = alt[:, 0] / alt[:, 1]
+
+        lat = np.where([r[1] == 'N' for r in records], lat, -lat)
+        lon = np.where([r[3] == 'E' for r in records], lon, -lon)
+        ok = np.isfinite(lat) & np.isfinite(lon)
+
+        for i, good, la, lo, al in zip(valid, ok.tolist(), lat.tolist(), lon.tolist(), alt.tolist()):
+            if good:
+                results[i] = {
+                    'latitude': la,
+                    'longitude': lo,
+                    'altitude': al if al == al else None
+                }
+        return results
+
+    @staticmethod
+    def extract_gps_from_exif(image_path: str) -> Optional[Dict]:
+        """Extract GPS coordinates from image EXIF data"""
+        return ImageProcessor.decode_gps([ImageProcessor.extract_gps_raw(image_path)])[0]
+
+    @staticmethod
+    def _exiftool_gps_batch(image_paths: List[str]) -> List[Optional[Dict]]:
+        """Extract GPS for a batch of images with a single exiftool process"""
+        # Arguments are fed through stdin (-@ -) so long file lists never
+        # hit the command-line length limit; -fast2 stops exiftool from
+        # scanning past the EXIF block and decoding maker notes
+        args = ['-json', '-n', '-fast2', '-Composite:GPSLatitude', '-Composite:GPSLongitude',
+                '-EXIF:GPSAltitude', *image_paths]
+        try:
+            result = subprocess.run(['exiftool', '-@', '-'], input='\n'.join(args).encode(),
+                                    capture_output=True)
+            records = {r['SourceFile']: r for r in _json_loads(result.stdout)}
+        except (OSError, ValueError) as e:
+            print(f"  ⚠️  exiftool batch failed ({e}), falling back to per-file parsing")
+            return [ImageProcessor.extract_gps_from_exif(path) for path in image_paths]
+
+        gps_results = []
+        for path in image_paths:
+            record = records.get(path, {})
+            if 'GPSLatitude' not in record or 'GPSLongitude' not in record:
+                gps_results.append(None)
+                continue
+            alt = record.get('GPSAltitude')
+            gps_results.append({
+                'latitude': float(record['GPSLatitude']),
+                'longitude': float(record['GPSLongitude']),
+                'altitude': float(alt) if alt is not None else None
+            })
+        return gps_results
+
+    def _exiftool_gps(self, image_paths: List[str]) -> List[Optional[Dict]]:
+        """Split images across one exiftool process per worker"""
+        chunk_size = -(-len(image_paths) // self.jobs)
+        chunks = [image_paths[i:i + chunk_size]
+                  for i in range(0, len(image_paths), chunk_size)]
+        with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+            return [gps for batch in pool.map(self._exiftool_gps_batch, chunks)
+                    for gps in batch]
+
+    @staticmethod
+    def _dedupe_key(entry: os.DirEntry) -> tuple:
+        """Cheap identity for an image: file size plus a hash of its first 4 KB"""
+        with open(entry.path, 'rb') as f:
+            digest = hashlib.blake2b(f.read(DEDUPE_HEADER_BYTES), digest_size=16).hexdigest()
+        return entry.stat().st_size, digest
+
+    @staticmethod
+    def _fast_jpeg_size(path: str) -> Optional[List[int]]:
+        """[width, height] from a JPEG's frame header, or None if it has no readable one"""
+        # Same segment walk as the EXIF lookup, stopping at the SOFn marker;
+        # none of the compressed image data is touched
+        try:
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if data[:2] != b'\xff\xd8':
+                    return None
+                pos = 2
+                while pos + 9 <= len(data) and data[pos] == 0xFF:
+                    marker = data[pos + 1]
+                    if marker == 0xFF:  # Fill byte ahead of a marker
+                        pos += 1
+                        continue
+                    if marker == 0x01 or 0xD0 <= marker <= 0xD7:  # No length field
+                        pos += 2
+                        continue
+                    if marker in (0xD9, 0xDA):
+                        return None
+                    if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                        height, width = struct.unpack_from('>HH', data, pos + 5)
+                        return [width, height] if width and height else None
+                    pos += 2 + struct.unpack_from('>H', data, pos + 2)[0]
+        except (ValueError, OSError):  # empty or unreadable file
+            pass
+        return None
+
+    def _load_exif_cache(self) -> Dict:
+        """Load {abspath: [size, mtime_ns, gps, dedupe digest, jpeg size]} saved by the previous run"""
+        try:
+            return _json_loads(self.exif_cache_file.read_bytes())
+        except (OSError, ValueError):
+            return {}
+
+    def _save_exif_cache(self, cache: Dict):
+        """Persist the EXIF cache (temp file + rename, like the progress file)"""
+        tmp_file = self.exif_cache_file.with_suffix('.json.tmp')
+        tmp_file.write_bytes(_json_bytes(cache))
+        os.replace(tmp_file, self.exif_cache_file)
+
     def prepare_images(self) -> List[Dict]:
         """Prepare images for processing and extract metadata"""
+        self._make_output_dirs()
         image_info = []
-        image_extensions = ['.jpg', '.jpeg', '.png', '.tif', '.tiff']
 
         print("Scanning for images...")
-        for image_path in self.input_dir.iterdir():
-            if image_path.suffix.lower() in image_extensions:
-                gps_data = self.extract_gps_from_exif(str(image_path))
-
-                info = {
-                    'filename': image_path.name,
-                    'path': str(image_path),
-                    'gps': gps_data
-                }
-
-                image_info.append(info)
-
-                # Copy to processed directory
-                shutil.copy2(image_path, self.processed_dir / image_path.name)
+        # DirEntry names and types come from the directory read itself, so
+        # filtering needs no per-file stat() or Path construction
+        with os.scandir(self.input_dir) as it:
+            entries = [entry for entry in it
+                       if entry.name.lower().endswith(IMAGE_EXTENSIONS) and entry.is_file()]
+
+        # Files whose size and mtime match the previous run reuse its dedupe
+        # digest and GPS, so a rerun does not open unchanged images at all
+        exif_cache = self._load_exif_cache()
+        abs_paths = [os.path.abspath(entry.path) for entry in entries]
+        stamps = [[st.st_size, st.st_mtime_ns] for st in (entry.stat() for entry in entries)]
+        cached = [exif_cache.get(path) for path in abs_paths]
+        cached = [hit if hit is not None and len(hit) == 5 and hit[:2] == stamp else None
+                  for hit, stamp in zip(cached, stamps)]
+
+        # Drop duplicate files (e.g. the same SD card copied in twice)
+        # before they cost EXIF parsing and ODM matching time
+        keys = [(hit[0], hit[3]) if hit else None for hit in cached]
+        misses = [i for i, key in enumerate(keys) if key is None]
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            for i, key in zip(misses, pool.map(self._dedupe_key, [entries[i] for i in misses])):
+                keys[i] = key
+        first_seen = {}
+        for i, key in enumerate(keys):
+            first_seen.setdefault(key, i)
+        if len(first_seen) < len(entries):
+            print(f"  Skipping {len(entries) - len(first_seen)} duplicate images")
+            kept = sorted(first_seen.values())
+            entries, abs_paths, stamps, cached, keys = (
+                [column[i] for i in kept] for column in (entries, abs_paths, stamps, cached, keys))
+
+        # Read JPEG frame sizes from the SOF marker alone. Odd sizes and
+        # unreadable frame headers are only reported: mixed-camera and
+        # mixed-mode missions are legitimate, so photos are dropped only
+        # when an expected frame size was given
+        is_jpeg = [entry.name.lower().endswith(('.jpg', '.jpeg')) for entry in entries]
+        sizes = [hit[4] if hit else None for hit in cached]
+        misses = [i for i, hit in enumerate(cached) if not hit and is_jpeg[i]]
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            for i, size in zip(misses, pool.map(self._fast_jpeg_size, [entries[i].path for i in misses])):
+                sizes[i] = size
+        unreadable = sum(1 for i, size in enumerate(sizes) if is_jpeg[i] and not size)
+        if self.frame_size:
+            expected = sorted(self.frame_size)  # Either orientation
+            kept = [i for i, size in enumerate(sizes)
+                    if not is_jpeg[i] or (size and sorted(size) == expected)]
+            if len(kept) < len(entries):
+                print(f"  Skipping {len(entries) - len(kept)} JPEGs that are not "
+                      f"{self.frame_size[0]}x{self.frame_size[1]} or have no readable frame header")
+                entries, abs_paths, stamps, cached, keys, sizes = (
+                    [column[i] for i in kept] for column in (entries, abs_paths, stamps, cached, keys, sizes))
+        else:
+            frame_counts = Counter(tuple(size) for size in sizes if size)
+            if frame_counts:
+                (width, height), common = frame_counts.most_common(1)[0]
+                odd = sum(frame_counts.values()) - common
+                if odd or unreadable:
+                    print(f"  ⚠️  {odd} JPEGs differ from the usual {width}x{height} frame and "
+                          f"{unreadable} have no readable frame header; keeping them "
+                          f"(use --frame-size WxH to leave them out)")
+
+        gps_results = [hit[2] if hit else None for hit in cached]
+        pending = [i for i, hit in enumerate(cached) if not hit]
+        if len(pending) < len(entries):
+            print(f"  Reusing cached EXIF for {len(entries) - len(pending)} unchanged images")
+
+        path_strings = [entries[i].path for i in pending]
+
+        # Parse EXIF inline for a handful of images, otherwise in worker
+        # processes (page faults on the mapped headers hold the GIL, so
+        # threads would not overlap the disk reads), or in batched exiftool
+        # runs for large datasets
+        if len(path_strings) < EXIF_POOL_MIN_IMAGES:
+            parsed = self.decode_gps([self.extract_gps_raw(path) for path in path_strings])
+        elif len(path_strings) >= EXIFTOOL_BATCH_MIN_IMAGES and shutil.which('exiftool'):
+            print("  Using exiftool batch mode for EXIF extraction")
+            parsed = self._exiftool_gps(path_strings)
+        else:
+            # A few chunks per worker keeps pickling round-trips low while
+            # still balancing load across uneven file sizes
+            chunksize = max(1, len(path_strings) // (self.jobs * 4))
+            with ProcessPoolExecutor(max_workers=self.jobs) as exif_pool:
+                parsed = self.decode_gps(list(exif_pool.map(self.extract_gps_raw, path_strings,
+                                                            chunksize=chunksize)))
+        for i, gps_data in zip(pending, parsed):
+            gps_results[i] = gps_data
+
+        self._save_exif_cache({path: [*stamp, gps_data, key[1], size]
+                               for path, stamp, gps_data, key, size
+                               in zip(abs_paths, stamps, gps_results, keys, sizes)})
+
+        for entry, path, gps_data in zip(entries, abs_paths, gps_results):
+            image_info.append({
+                'filename': entry.name,
+                'path': path,
+                'gps': gps_data
+            })
+
+        # Images are not staged anywhere; the manifest records where they
+        # live in the input dir
+        self.manifest_file.write_bytes(_json_bytes(image_info))
 
         print(f"Found {len(image_info)} images")
         if gps_enabled := sum(1 for img in image_info if img['gps']):
@@ -116,63 +615,75 @@ class ImageProcessor:
         return image_info
 
     def load_progress(self) -> Dict:
-        """Load processing progress from file"""
-        if self.progress_file.exists():
-            with open(self.progress_file, 'r') as f:
-                return json.load(f)
-        return {
-            'status': 'not_started',
-            'current_stage': None,
-            'completed_stages': [],
-            'start_time': None,
-            'last_update': None,
-            'estimated_completion': None
-        }
+        """Load processing progress from file (cached after the first read)"""
+        if self._progress is None:
+            if self.progress_file.exists():
+                self._progress = _json_loads(self.progress_file.read_bytes())
+            else:
+                self._progress = {
+                    'status': 'not_started',
+                    'current_stage': None,
+                    'completed_stages': [],
+                    'start_time': None,
+                    'last_update': None,
+                    'estimated_completion': None
+                }
+            self._completed_stages = set(self._progress.get('completed_stages', []))
+        return self._progress
 
     def save_progress(self, progress: Dict):
         """Save processing progress to file"""
         progress['last_update'] = datetime.now().isoformat()
-        with open(self.progress_file, 'w') as f:
-            json.dump(progress, f, indent=2)
+        self._progress = progress
+        self._completed_stages = set(progress.get('completed_stages', []))
+        # Write to a temp file and rename so --progress never sees a partial file
+        tmp_file = self.progress_file.with_suffix('.json.tmp')
+        tmp_file.write_bytes(_json_bytes(progress))
+        os.replace(tmp_file, self.progress_file)
+        self._progress_dirty = False
+
+    def _match_log_line(self, line: str, kind: str) -> Optional[str]:
+        """Return the first ODM stage name or progress marker found in a log line"""
+        if self._aho is not None:
+            for _, (found_kind, word) in self._aho.iter(line.lower()):
+                if found_kind == kind:
+                    return word
+            return None
+
+        pattern = self._stage_re if kind == 'stage' else self._progress_re
+        match = pattern.search(line)
+        return match.group(0).lower() if match else None
 
     def estimate_stage_progress(self, current_stage: str, log_line: str) -> float:
         """Estimate progress within current ODM stage"""
-        # Stage weights (approximate time percentages)
-        stage_weights = {
-            'dataset': 5,
-            'opensfm': 40,  # Feature detection/matching - longest stage
-            'mve': 10,
-            'odm_filterpoints': 5,
-            'odm_meshing': 10,
-            'mvs_texturing': 10,
-            'odm_georeferencing': 5,
-            'odm_dem': 10,
-            'odm_orthophoto': 5
-        }
-
-        total_weight = sum(stage_weights.values())
-        completed_weight = sum(stage_weights.get(s, 0) for s in self.odm_stages
-                              if s in self.load_progress().get('completed_stages', []))
+        self.load_progress()
+        completed_weight = sum(self.stage_weights[s]
+                               for s in self._completed_stages & self.stage_weights.keys())
 
         # Current stage progress indicators
-        current_stage_weight = stage_weights.get(current_stage, 5)
+        current_stage_weight = self.stage_weights.get(current_stage, 5)
         stage_progress = 0.0
 
-        if 'detect_features' in log_line or 'Extracting features' in log_line:
-            stage_progress = 0.2
-        elif 'match_features' in log_line or 'Matching features' in log_line:
-            stage_progress = 0.5
-        elif 'reconstruction' in log_line or 'Reconstructing' in log_line:
-            stage_progress = 0.7
-        elif 'completed' in log_line.lower() or 'finished' in log_line.lower():
-            stage_progress = 1.0
+        marker = self._match_log_line(log_line, 'progress')
+        if marker:
+            stage_progress = self._progress_markers[marker]
 
         current_contribution = current_stage_weight * stage_progress
-        overall_progress = (completed_weight + current_contribution) / total_weight
+        overall_progress = (completed_weight + current_contribution) / self._total_stage_weight
 
         return min(100.0, overall_progress * 100)
 
-    def create_odm_project(self, project_name: str, resume: bool = False) -> Path:
+    def count_project_images(self, images_dir: Path) -> int:
+        """Count images in an ODM project (cached after the first scan)"""
+        if self._image_count is None:
+            if not images_dir.exists():
+                return 0
+            with os.scandir(images_dir) as it:
+                self._image_count = sum(1 for _ in it)
+        return self._image_count
+
+    def create_odm_project(self, project_name: str, image_info: List[Dict],
+                           resume: bool = False) -> Path:
         """Create OpenDroneMap project structure"""
         odm_project = self.output_dir / "odm_project" / project_name
         odm_images = odm_project / "images"
@@ -180,23 +691,41 @@ class ImageProcessor:
         # Check if project already exists (resume scenario)
         if resume and odm_project.exists():
             print(f"📂 Resuming existing ODM project: {project_name}")
-            existing_images = list(odm_images.glob('*')) if odm_images.exists() else []
-            print(f"   Found {len(existing_images)} existing images")
+            print(f"   Found {self.count_project_images(odm_images)} existing images")
             return odm_project
 
         odm_images.mkdir(parents=True, exist_ok=True)
 
-        # Copy processed images to ODM project
+        # Link input images straight into the ODM project. Symlinks are not
+        # an option: their targets are outside the directory Docker mounts
         print("📋 Preparing images for ODM...")
-        image_count = 0
-        for image in self.processed_dir.iterdir():
-            if image.is_file():
-                shutil.copy2(image, odm_images / image.name)
-                image_count += 1
-        print(f"   Copied {image_count} images to project")
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            methods = list(pool.map(lambda img: fast_copy(img['path'], odm_images / img['filename']),
+                                    image_info))
+        self._image_count = len(image_info)
+        summary = ', '.join(f"{method} {methods.count(method)}"
+                            for method in ('linked', 'reflinked', 'copied') if method in methods)
+        print(f"   Added {len(image_info)} images to project ({summary})")
+        if 'copied' in methods:
+            print("   ⚠️  Some images were copied: put --output on the same filesystem as the photos to link them instead")
 
         return odm_project
 
+    @staticmethod
+    def _docker_resources() -> Tuple[Optional[int], Optional[float]]:
+        """
+        CPUs and memory (GB) the Docker daemon can hand a container, or
+        (None, None) when docker info fails. On Docker Desktop this is the
+        VM's share, which is smaller than the host's
+        """
+        try:
+            result = subprocess.run(['docker', 'info', '--format', '{{.NCPU}} {{.MemTotal}}'],
+                                    capture_output=True, text=True, timeout=15)
+            ncpu, mem_total = result.stdout.split()
+            return int(ncpu), int(mem_total) / 1024**3
+        except (OSError, subprocess.TimeoutExpired, ValueError):
+            return None, None
+
     def run_opendronemap(self, project_path: Path, options: Dict = None, resume: bool = False) -> bool:
         """
         Run OpenDroneMap processing via Docker
@@ -204,14 +733,14 @@ class ImageProcessor:
         """
         # Count images to determine optimal settings
         images_dir = project_path / "images"
-        image_count = len(list(images_dir.glob('*'))) if images_dir.exists() else 0
+        image_count = self.count_project_images(images_dir)
 
         print(f"📊 Dataset: {image_count} images")
 
         # Adaptive settings based on dataset size
         if image_count < 300:
             # Small dataset: don't use split, better quality
-            print("   Using optimized settings for small dataset (no split processing)")
+            tier = 'small'
             default_options = {
                 'dsm': True,
                 'dtm': False,
@@ -224,12 +753,12 @@ class ImageProcessor:
                 'ignore-gsd': False,
                 'matcher-neighbors': 8,
                 'auto-boundary': True,
-                'max-concurrency': 4,
+                'skip-report': True,  # Only the orthophoto is used
                 'optimize-disk-space': False  # Keep files for debugging
             }
         elif image_count < 500:
             # Medium dataset: conservative split
-            print("   Using optimized settings for medium dataset (split=100)")
+            tier = 'medium'
             default_options = {
                 'dsm': True,
                 'dtm': False,
@@ -244,12 +773,12 @@ class ImageProcessor:
                 'auto-boundary': True,
                 'split': 100,
                 'split-overlap': 150,
-                'max-concurrency': 3,
+                'skip-report': True,
                 'optimize-disk-space': True
             }
         else:
             # Large dataset: aggressive split
-            print("   Using optimized settings for large dataset (split=200)")
+            tier = 'large'
             default_options = {
                 'dsm': True,
                 'dtm': False,
@@ -264,10 +793,28 @@ class ImageProcessor:
                 'auto-boundary': True,
                 'split': 200,
                 'split-overlap': 100,
-                'max-concurrency': 2,
+                'skip-report': True,
                 'optimize-disk-space': True
             }
 
+        # Size split submodels to the RAM the container can actually get:
+        # ODM peaks at roughly 4 GB per 50 images in a submodel, so allow
+        # ~12.5 images/GB
+        docker_cpus, docker_memory_gb = self._docker_resources()
+        if docker_memory_gb and 'split' in default_options:
+            default_options['split'] = min(250, max(50, int(docker_memory_gb * 12.5)))
+        if 'split' in default_options:
+            print(f"   Using optimized settings for {tier} dataset (split={default_options['split']})")
+        else:
+            print(f"   Using optimized settings for {tier} dataset (no split processing)")
+
+        # Run one ODM worker per CPU the container is given; split datasets
+        # also keep ~4 GB of RAM per worker for the heavier submodel stages
+        odm_cpus = max(1, (docker_cpus or os.cpu_count() or 2) - 1)
+        default_options['max-concurrency'] = odm_cpus
+        if docker_memory_gb and 'split' in default_options:
+            default_options['max-concurrency'] = max(1, min(odm_cpus, int(docker_memory_gb // 4)))
+
         if options:
             default_options.update(options)
 
@@ -296,9 +843,19 @@ class ImageProcessor:
 
         self.save_progress(progress)
 
-        # Build ODM Docker command
-        cmd = [
-            'docker', 'run', '--rm',
+        # Build ODM Docker command. Explicit limits leave headroom for the
+        # host so an oversized stage gets OOM-killed (exit 137) instead of
+        # driving the whole machine into swap; ODM also needs more /dev/shm
+        # than Docker's 64 MB default. The limits come from docker info, as
+        # docker run rejects a --cpus above what the daemon has; without it
+        # they are left out
+        cmd = ['docker', 'run', '--rm']
+        if docker_memory_gb and int(docker_memory_gb * 0.8) >= 1:
+            cmd += ['--memory', f'{int(docker_memory_gb * 0.8)}g']
+        if docker_cpus:
+            cmd += ['--cpus', str(odm_cpus)]
+        cmd += [
+            '--shm-size', '2g',
             '-v', f'{project_parent}:/datasets',
             'opendronemap/odm',
             '--project-path', '/datasets',
@@ -331,44 +888,48 @@ class ImageProcessor:
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
+                bufsize=1024 * 1024
             )
+            # Decode in large blocks rather than line-buffered text mode
+            odm_output = io.TextIOWrapper(process.stdout, encoding='utf-8',
+                                          errors='replace', newline='')
 
             current_stage = None
-            last_progress_update = datetime.now()
+            last_progress_update = time.monotonic()
 
             # Stream output in real-time with progress tracking
-            for line in process.stdout:
+            for line in odm_output:
                 print(line, end='')
 
                 # Detect current stage
-                for stage in self.odm_stages:
-                    if stage in line.lower() or f"running {stage}" in line.lower():
-                        if current_stage != stage:
-                            current_stage = stage
-                            progress['current_stage'] = stage
-                            if stage not in progress['completed_stages']:
-                                print(f"\n{'='*60}")
-                                print(f"📍 Stage: {stage}")
-                                print(f"{'='*60}")
-                        break
+                stage = self._match_log_line(line, 'stage')
+                if stage:
+                    if current_stage != stage:
+                        current_stage = stage
+                        progress['current_stage'] = stage
+                        self.save_progress(progress)
+                        if stage not in self._completed_stages:
+                            print(f"\n{'='*60}")
+                            print(f"📍 Stage: {stage}")
+                            print(f"{'='*60}")
 
                 # Update progress every 30 seconds
-                if (datetime.now() - last_progress_update).seconds >= 30:
+                if time.monotonic() - last_progress_update >= 30.0:
                     if current_stage:
                         overall_progress = self.estimate_stage_progress(current_stage, line)
                         progress['estimated_completion'] = overall_progress
-                        self.save_progress(progress)
+                        self._progress_dirty = True
                         print(f"\n⏱️  Overall Progress: {overall_progress:.1f}%")
-                    last_progress_update = datetime.now()
+                    if self._progress_dirty:
+                        self.save_progress(progress)
+                    last_progress_update = time.monotonic()
 
                 # Detect completed stages
                 if 'running' in line.lower() and current_stage:
-                    if current_stage not in progress['completed_stages']:
+                    if current_stage not in self._completed_stages:
                         progress['completed_stages'].append(current_stage)
-                        self.save_progress(progress)
+                        self._completed_stages.add(current_stage)
+                        self._progress_dirty = True
 
             # Wait for completion
             process.wait()
@@ -509,29 +1070,83 @@ class ImageProcessor:
         """
         print("Creating simple mosaic with ImageMagick...")
 
-        try:
-            # Check if ImageMagick is installed (v7 uses 'magick' command)
-            subprocess.run(['magick', '--version'],
-                         capture_output=True, check=True)
+        if not image_list:
+            print("No images to mosaic")
+            return False
 
-            # Limit number of images for mosaic (too many can cause memory issues)
-            max_images = 100
-            if len(image_list) > max_images:
-                print(f"Using first {max_images} images for mosaic (out of {len(image_list)} total)")
-                image_list = image_list[:max_images]
+        # Check if ImageMagick is installed (v7 uses 'magick' command)
+        magick = self._magick_path
+        if magick is None:
+            print("ImageMagick not found.")
+            print("Install with: brew install imagemagick")
+            return False
 
-            # Create mosaic using montage (part of ImageMagick)
+        try:
+            # Stage 1: shrink every photo to a thumbnail. mogrify handles one
+            # file at a time, so memory stays flat however many photos there
+            # are; one mogrify per worker runs the chunks in parallel.
+            # jpeg:size lets the decoder downscale while reading
             output_file = self.ortho_dir / "simple_mosaic.jpg"
-            cmd = ['magick', 'montage'] + image_list + [
-                '-tile', '10x10',
-                '-geometry', '200x200+2+2>',  # Resize to max 200x200 pixels, keep aspect ratio
-                '-background', 'white',
-                '-quality', '85',
-                str(output_file)
-            ]
+            thumbs_dir = self.ortho_dir / "mosaic_thumbs"
+            sources_dir = self.ortho_dir / "mosaic_sources"
+            for work_dir in (thumbs_dir, sources_dir):
+                if work_dir.exists():
+                    shutil.rmtree(work_dir)
+                work_dir.mkdir()
+
+            # mogrify -path names each thumbnail after its input's basename,
+            # so photos from different folders sharing a name would overwrite
+            # each other; feed it index-named symlinks instead
+            sources = []
+            for index, image_path in enumerate(image_list):
+                source = sources_dir / f"{index:06d}{Path(image_path).suffix}"
+                source.symlink_to(os.path.abspath(image_path))
+                sources.append(str(source))
+
+            print(f"Creating thumbnails for {len(image_list)} images...")
+            # Each mogrify is pinned to one OpenMP thread: the processes
+            # already fill the cores, and nested threading only oversubscribes
+            chunk_size = -(-len(sources) // self.jobs)
+            chunks = [sources[i:i + chunk_size] for i in range(0, len(sources), chunk_size)]
+            mogrify_env = {**os.environ, 'MAGICK_THREAD_LIMIT': '1'}
+            with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+                results = list(pool.map(lambda chunk: subprocess.run(
+                    [magick, 'mogrify', '-path', str(thumbs_dir),
+                     '-define', 'jpeg:size=400x400',
+                     '-thumbnail', '200x200>',  # Max 200x200 pixels, keep aspect ratio
+                     '-format', 'jpg', '-quality', '85', *chunk],
+                    capture_output=True, text=True, env=mogrify_env), chunks))
+            shutil.rmtree(sources_dir, ignore_errors=True)
+            failed = [result for result in results if result.returncode != 0]
+            if failed:
+                print(f"ImageMagick error: {failed[0].stderr}")
+                return False
 
-            print(f"Creating mosaic from {len(image_list)} images...")
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            # Stage 2: tile the small thumbnails into a square-ish grid.
+            # Inputs go through an @filelist rather than argv; pixel cache is
+            # capped so large grids spill to disk instead of swapping
+            thumbs = sorted(str(path) for path in thumbs_dir.iterdir())
+            file_list = self.ortho_dir / "mosaic_images.txt"
+            file_list.write_text(''.join(f'"{path}"\n' for path in thumbs))
+            columns = math.ceil(math.sqrt(len(thumbs)))
+
+            def montage_cmd(inputs):
+                return [magick, 'montage',
+                        '-limit', 'memory', '512MiB',
+                        '-limit', 'map', '2GiB'] + inputs + [
+                    '-tile', f'{columns}x',
+                    '-geometry', '+2+2',
+                    '-background', 'white',
+                    '-quality', '85',
+                    str(output_file)
+                ]
+
+            print(f"Creating mosaic from {len(thumbs)} images...")
+            result = subprocess.run(montage_cmd([f'@{file_list}']), capture_output=True, text=True)
+            if result.returncode != 0 and 'not authorized' in result.stderr:
+                # Some distro security policies block @file reads
+                result = subprocess.run(montage_cmd(thumbs), capture_output=True, text=True)
+            shutil.rmtree(thumbs_dir, ignore_errors=True)
             if result.returncode == 0:
                 print(f"Simple mosaic created: {output_file}")
                 return True
@@ -539,26 +1154,38 @@ class ImageProcessor:
                 print(f"ImageMagick error: {result.stderr}")
                 return False
 
-        except (FileNotFoundError, subprocess.CalledProcessError):
-            print("ImageMagick not found or failed.")
-            print("Install with: brew install imagemagick")
+        except OSError as e:
+            print(f"ImageMagick failed to run: {e}")
             return False
 
     def generate_report(self, image_info: List[Dict], processing_success: bool):
         """Generate processing report"""
+        # Partition once; the count and the coverage map share the list
+        gps_images = [img for img in image_info if img['gps']]
+        now = datetime.now()
         report = {
-            'processing_date': datetime.now().isoformat(),
+            'processing_date': now.isoformat(),
             'input_directory': str(self.input_dir),
             'output_directory': str(self.output_dir),
             'total_images': len(image_info),
-            'images_with_gps': sum(1 for img in image_info if img['gps']),
-            'processing_success': processing_success,
-            'images': image_info
+            'images_with_gps': len(gps_images),
+            'processing_success': processing_success
         }
 
-        report_file = self.report_dir / f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(report_file, 'w') as f:
-            json.dump(report, f, indent=2)
+        # Stream the image list one compact record per line instead of
+        # pretty-printing the whole report as a single buffer
+        report_file = self.report_dir / f"report_{now.strftime('%Y%m%d_%H%M%S')}.json"
+        with open(report_file, 'wb') as f:
+            f.write(b'{')
+            for key, value in report.items():
+                f.write(b'\n  ' + _json_bytes(key) + b': ' + _json_bytes(value) + b',')
+
+            f.write(b'\n  "images": [')
+            separator = b'\n    '
+            for img in image_info:
+                f.write(separator + _json_bytes(img))
+                separator = b',\n    '
+            f.write(b'\n  ]\n}\n')
 
         print(f"\nProcessing Report:")
         print(f"  Total images: {report['total_images']}")
@@ -566,8 +1193,8 @@ class ImageProcessor:
         print(f"  Report saved to: {report_file}")
 
         # Generate coverage map if GPS data available
-        if report['images_with_gps'] > 0:
-            self.generate_coverage_map(image_info)
+        if gps_images:
+            self.generate_coverage_map(gps_images)
 
     def create_web_outputs(self, project_path: Path) -> bool:
         """
@@ -584,22 +1211,30 @@ class ImageProcessor:
         print("🌐 Generating Web Outputs")
         print("=" * 60)
 
-        # Generate map tiles
+        # Generate map tiles, or a single COG the viewer reads with range requests
         tiles_dir = self.output_dir / "tiles"
-        tiles_success = self.generate_tiles_from_geotiff(orthophoto_path, tiles_dir)
+        cog_path = None
+        if self.cog:
+            cog_path = self.output_dir / "orthophoto_cog.tif"
+            tiles_success = self.generate_cog(orthophoto_path, cog_path)
+        else:
+            tiles_success = self.generate_tiles_from_geotiff(orthophoto_path, tiles_dir)
 
         if tiles_success:
             # Create tiled viewer
-            self.create_tiled_viewer(tiles_dir)
+            self.create_tiled_viewer(tiles_dir, cog_path)
 
             # Create web deployment package
-            self.create_web_package(tiles_dir, orthophoto_path)
+            self.create_web_package(tiles_dir, orthophoto_path, cog_path)
 
             print("\n" + "=" * 60)
             print("✅ Web outputs created successfully!")
             print("=" * 60)
             print(f"\n📂 Outputs:")
-            print(f"   Tiles:         {tiles_dir}")
+            if cog_path:
+                print(f"   COG:           {cog_path}")
+            else:
+                print(f"   Tiles:         {tiles_dir}")
             print(f"   Tiled Viewer:  {self.output_dir / 'tiled_viewer.html'}")
             print(f"   Web Package:   {self.output_dir / 'web_package'}")
             print(f"\n🌐 To view locally:")
@@ -611,6 +1246,145 @@ class ImageProcessor:
 
         return False
 
+    def generate_cog(self, geotiff_path: Path, cog_path: Path = None) -> bool:
+        """
+        Convert a GeoTIFF into a web-optimized Cloud-Optimized GeoTIFF
+        Internal 512px tiles + overviews, so viewers fetch only the byte
+        ranges they need instead of a pre-rendered tile pyramid
+        """
+        if not geotiff_path.exists():
+            print(f"❌ GeoTIFF not found: {geotiff_path}")
+            return False
+
+        if cog_path is None:
+            cog_path = self.output_dir / "orthophoto_cog.tif"
+        cog_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write a new file rather than over the old one: the web package
+        # may hold a hardlink to it
+        cog_path.unlink(missing_ok=True)
+
+        print("\n" + "="*60)
+        print("🗺️  Generating Cloud-Optimized GeoTIFF")
+        print("="*60)
+        print(f"Source: {geotiff_path}")
+        print(f"Output: {cog_path}")
+
+        if shutil.which('gdal_translate'):
+            cmd = [
+                'gdal_translate', '-of', 'COG',
+                '-co', 'TILING_SCHEME=GoogleMapsCompatible',  # Web mercator, aligned to XYZ tiles
+                '-co', 'COMPRESS=JPEG',
+                '-co', 'BLOCKSIZE=512',
+                '-co', 'OVERVIEWS=AUTO',
+                '-co', 'OVERVIEW_RESAMPLING=AVERAGE',
+                '-co', f'NUM_THREADS={self.jobs}',
+                str(geotiff_path), str(cog_path)
+            ]
+        elif shutil.which('rio'):
+            cmd = [
+                'rio', 'cogeo', 'create', '--web-optimized',
+                '--cog-profile', 'jpeg',
+                '--overview-resampling', 'average',
+                '--threads', str(self.jobs),
+                str(geotiff_path), str(cog_path)
+            ]
+        else:
+            print("❌ Neither gdal_translate nor rio-cogeo found!")
+            print("\nTo install GDAL:")
+            print("  macOS:  brew install gdal")
+            print("  Ubuntu: sudo apt-get install gdal-bin")
+            print("  pip:    pip install rio-cogeo")
+            return False
+
+        print(f"\nCommand: {' '.join(cmd)}\n")
+        result = subprocess.run(cmd)
+        if result.returncode != 0:
+            print(f"\n❌ COG generation failed with return code: {result.returncode}")
+            return False
+
+        size_mb = cog_path.stat().st_size / (1024 * 1024)
+        print(f"\n✅ COG generated successfully! ({size_mb:.1f} MB)")
+        return True
+
+    @staticmethod
+    def _iter_tiles(tiles_dir: Path, ext: str):
+        """Yield DirEntry objects for every tile with the given extension"""
+        pending = [tiles_dir]
+        while pending:
+            with os.scandir(pending.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.name.endswith(ext):
+                        yield entry
+
+    def _tile_stats(self, tiles_dir: Path) -> tuple:
+        """Count tiles and their total size in a single directory walk"""
+        tile_count = 0
+        total_size = 0
+        for entry in self._iter_tiles(tiles_dir, self.tile_ext):
+            tile_count += 1
+            total_size += entry.stat(follow_symlinks=False).st_size
+        return tile_count, total_size
+
+    @staticmethod
+    def _png_to_webp(png_path: str):
+        """Re-encode one PNG tile as WebP (alpha is kept) and drop the PNG"""
+        with Image.open(png_path) as tile:
+            tile.save(png_path[:-4] + '.webp', 'WEBP', quality=80, method=4)
+        os.remove(png_path)
+
+    def convert_tiles_to_webp(self, tiles_dir: Path):
+        """Re-encode the gdal2tiles PNG pyramid as WebP across worker processes"""
+        png_paths = [entry.path for entry in self._iter_tiles(tiles_dir, '.png')]
+        print(f"\n🗜️  Converting {len(png_paths):,} tiles to WebP...")
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            list(pool.map(self._png_to_webp, png_paths, chunksize=64))
+
+    def optimize_png_tiles(self, tiles_dir: Path):
+        """Losslessly recompress PNG tiles with oxipng when it is installed"""
+        if shutil.which('oxipng') is None:
+            return
+        print(f"\n🗜️  Optimizing PNG tiles with oxipng...")
+        result = subprocess.run(['oxipng', '-o', '2', '--strip', 'safe', '-r',
+                                 '--threads', str(self.jobs), str(tiles_dir)],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"  ⚠️  oxipng failed, keeping tiles as generated: {result.stderr.strip()}")
+
+    @staticmethod
+    def _useful_zoom_range(geotiff_path: Path, default: tuple = (10, 22)) -> tuple:
+        """
+        Web-mercator zoom range worth tiling for the GeoTIFF
+        Tops out at the level its resolution can fill and starts where the
+        whole extent shrinks to about one tile
+        """
+        if rasterio is None:
+            return default
+        try:
+            with rasterio.open(geotiff_path) as ds:
+                gsd = abs(ds.transform.a)
+                extent = max(ds.width, ds.height) * gsd
+                center_x = (ds.bounds.left + ds.bounds.right) / 2
+                center_y = (ds.bounds.bottom + ds.bounds.top) / 2
+                if ds.crs.is_geographic:
+                    lat = center_y
+                    gsd *= 111320 * math.cos(math.radians(lat))
+                    extent *= 111320 * math.cos(math.radians(lat))
+                else:
+                    _, lats = rasterio.warp.transform(ds.crs, 'EPSG:4326', [center_x], [center_y])
+                    lat = lats[0]
+        except Exception as e:
+            print(f"⚠️  Could not read GeoTIFF resolution ({e}), using zoom {default[0]}-{default[1]}")
+            return default
+
+        # Tile resolution at zoom z is 156543.03 * cos(lat) / 2^z metres per
+        # pixel, so one 256px tile spans 40075016.686 * cos(lat) / 2^z metres
+        cos_lat = math.cos(math.radians(lat))
+        z_max = max(10, min(default[1], math.ceil(math.log2(156543.03 * cos_lat / gsd))))
+        z_min = math.floor(math.log2(40075016.686 * cos_lat / max(extent, 1.0)))
+        return max(0, min(z_max, z_min)), z_max
+
     def generate_tiles_from_geotiff(self, geotiff_path: Path, output_dir: Path = None) -> bool:
         """
         Generate web map tiles from GeoTIFF using gdal2tiles
@@ -623,6 +1397,11 @@ class ImageProcessor:
         if output_dir is None:
             output_dir = self.output_dir / "tiles"
 
+        # Start from an empty pyramid: gdal2tiles, the WebP pass and oxipng
+        # write tiles in place, and the web package hardlinks the previous
+        # run's tiles, so they must only ever see new files
+        if output_dir.exists():
+            shutil.rmtree(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
         print("\n" + "="*60)
@@ -641,6 +1420,7 @@ class ImageProcessor:
             ]
 
             gdal2tiles_cmd = None
+            native_webp = False
             for cmd in gdal2tiles_commands:
                 try:
                     result = subprocess.run(
@@ -651,6 +1431,9 @@ class ImageProcessor:
                     )
                     if result.returncode == 0 or 'gdal2tiles' in result.stdout.lower():
                         gdal2tiles_cmd = cmd
+                        # GDAL 3.6+ gdal2tiles can write WebP tiles itself,
+                        # saving a decode/re-encode pass over every tile
+                        native_webp = self.tile_ext == '.webp' and '--tiledriver' in result.stdout
                         break
                 except (FileNotFoundError, subprocess.TimeoutExpired):
                     continue
@@ -664,50 +1447,51 @@ class ImageProcessor:
                 return False
 
             # Generate tiles with optimal settings for web viewing
-            # -z: zoom levels (auto calculates optimal range)
+            # -z: zoom levels (from ~one tile for the whole extent up to what
+            #     the orthophoto GSD can fill)
             # -w: web viewer (generates simple HTML viewer)
             # --processes: parallel processing for speed
+            min_zoom, max_zoom = self._useful_zoom_range(geotiff_path)
             cmd = gdal2tiles_cmd + [
-                '-z', '10-22',  # Zoom levels (10=regional, 22=very detailed)
+                '-z', f'{min_zoom}-{max_zoom}',  # Zoom levels (10=regional, 22=very detailed)
                 '-w', 'none',   # Don't generate default viewer (we'll make our own)
-                '--processes=4',  # Parallel processing
-                '-r', 'lanczos',  # High-quality resampling
+                f'--processes={self.jobs}',  # Parallel processing
+                '-r', 'average',  # Box-filter downsampling: much cheaper than lanczos per tile
                 '--xyz',  # XYZ tile scheme (standard web tiles)
-                str(geotiff_path),
-                str(output_dir)
             ]
+            if native_webp:
+                cmd += ['--tiledriver=WEBP', '--webp-quality=80']
+            cmd += [str(geotiff_path), str(output_dir)]
 
             print(f"\nCommand: {' '.join(cmd)}")
             print("\n⏳ Generating tiles (this may take a few minutes)...\n")
 
-            # Run with real-time output
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
-            )
-
-            for line in process.stdout:
-                # Filter out excessive progress messages
-                if '%' in line or 'Processing' in line:
-                    print(line, end='', flush=True)
-                else:
-                    print(line, end='')
-
-            process.wait()
+            # Nothing in gdal2tiles' output is parsed, so let it write straight
+            # to our terminal: no pipe, no decoding, and its "0...10...20"
+            # progress bar shows up as it is drawn instead of line by line
+            sys.stdout.flush()
+            process = subprocess.run(cmd)
+            if process.returncode != 0 and native_webp:
+                # GDAL built without the WEBP driver rejects --tiledriver
+                # before rendering anything: redo as PNG and convert below
+                print("\n⚠️  gdal2tiles could not write WebP tiles, generating PNG instead")
+                native_webp = False
+                cmd = [arg for arg in cmd if not arg.startswith(('--tiledriver', '--webp-'))]
+                sys.stdout.flush()
+                process = subprocess.run(cmd)
 
             if process.returncode == 0:
                 print("\n✅ Tiles generated successfully!")
 
-                # Count generated tiles
-                tile_count = sum(1 for _ in output_dir.rglob('*.png'))
+                if self.tile_ext == '.png':
+                    self.optimize_png_tiles(output_dir)
+                elif not native_webp:
+                    self.convert_tiles_to_webp(output_dir)
+
+                # Count generated tiles and total size
+                tile_count, total_size = self._tile_stats(output_dir)
                 print(f"   Generated {tile_count:,} tiles")
 
-                # Estimate tile directory size
-                total_size = sum(f.stat().st_size for f in output_dir.rglob('*.png'))
                 size_mb = total_size / (1024 * 1024)
                 print(f"   Total size: {size_mb:.1f} MB")
 
@@ -722,701 +1506,200 @@ class ImageProcessor:
             traceback.print_exc()
             return False
 
-    def generate_coverage_map(self, image_info: List[Dict]):
-        """Generate an interactive HTML map showing all photo locations"""
-        gps_images = [img for img in image_info if img['gps']]
-
+    def generate_coverage_map(self, gps_images: List[Dict]):
+        """Generate an interactive HTML map showing all photo locations (GPS-tagged images only)"""
         if not gps_images:
             return
 
+        # Build the photo payload as one (n, 3) array for lat/lon/alt
+        # (missing altitude is NaN, serialized as null) plus a list of names
+        coords = np.array([(img['gps']['latitude'], img['gps']['longitude'],
+                            alt if (alt := img['gps'].get('altitude')) is not None else np.nan)
+                           for img in gps_images], dtype=np.float64).reshape(-1, 3)
+
         # Calculate center point and bounds
-        avg_lat = sum(img['gps']['latitude'] for img in gps_images) / len(gps_images)
-        avg_lon = sum(img['gps']['longitude'] for img in gps_images) / len(gps_images)
-
-        # Calculate min/max for bounds
-        lats = [img['gps']['latitude'] for img in gps_images]
-        lons = [img['gps']['longitude'] for img in gps_images]
-        min_lat, max_lat = min(lats), max(lats)
-        min_lon, max_lon = min(lons), max(lons)
-
-        html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <title>Drone Photo Coverage Map</title>
-    <meta charset="utf-8" />
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css" />
-    <script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
-            background: #f5f5f5;
-        }}
-        .header {{
-            background: white;
-            padding: 20px 30px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            position: relative;
-            z-index: 1000;
-        }}
-        .header h1 {{
-            color: #2c3e50;
-            font-size: 24px;
-            margin-bottom: 8px;
-        }}
-        .stats {{
-            display: flex;
-            gap: 20px;
-            margin-top: 12px;
-            flex-wrap: wrap;
-        }}
-        .stat {{
-            background: #f8f9fa;
-            padding: 8px 16px;
-            border-radius: 6px;
-            border-left: 3px solid #ff6b35;
-        }}
-        .stat-label {{
-            font-size: 11px;
-            color: #7f8c8d;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-        }}
-        .stat-value {{
-            font-size: 18px;
-            font-weight: 600;
-            color: #2c3e50;
-            margin-top: 2px;
-        }}
-        #map {{
-            height: calc(100vh - 160px);
-            width: 100%;
-        }}
-        .leaflet-popup-content {{
-            font-size: 13px;
-            line-height: 1.5;
-        }}
-        .photo-popup {{
-            font-family: monospace;
-            color: #2c3e50;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>🗺️ Drone Mapping Coverage</h1>
-        <div class="stats">
-            <div class="stat">
-                <div class="stat-label">Total Photos</div>
-                <div class="stat-value">{len(gps_images)}</div>
-            </div>
-            <div class="stat">
-                <div class="stat-label">Coverage Area</div>
-                <div class="stat-value">{abs(max_lat - min_lat) * 111000:.0f}m × {abs(max_lon - min_lon) * 111000 * abs(avg_lat / 90):.0f}m</div>
-            </div>
-            <div class="stat">
-                <div class="stat-label">Center Point</div>
-                <div class="stat-value">{avg_lat:.6f}, {avg_lon:.6f}</div>
-            </div>
-        </div>
-    </div>
-    <div id="map"></div>
-    <script>
-        // Initialize map
-        var map = L.map('map', {{
-            zoomControl: true,
-            attributionControl: true
-        }});
-
-        // Add OpenStreetMap tile layer
-        L.tileLayer('https://{{s}}.tile.openstreetmap.org/{{z}}/{{x}}/{{y}}.png', {{
-            attribution: '© OpenStreetMap contributors',
-            maxZoom: 19
-        }}).addTo(map);
-
-        // Photo data
-        var photos = {json.dumps([{
-            'lat': img['gps']['latitude'],
-            'lon': img['gps']['longitude'],
-            'alt': img['gps'].get('altitude'),
-            'name': img['filename']
-        } for img in gps_images])};
-
-        // Add markers for each photo
-        var markers = [];
-        photos.forEach(function(photo, index) {{
-            var marker = L.circleMarker([photo.lat, photo.lon], {{
-                radius: 6,
-                fillColor: '#ff6b35',
-                color: '#ffffff',
-                weight: 2,
-                opacity: 1,
-                fillOpacity: 0.85
-            }});
-
-            // Create popup content
-            var popupContent = '<div class="photo-popup">';
-            popupContent += '<strong>Photo #' + (index + 1) + '</strong><br>';
-            popupContent += photo.name + '<br>';
-            popupContent += 'Lat: ' + photo.lat.toFixed(6) + '<br>';
-            popupContent += 'Lon: ' + photo.lon.toFixed(6);
-            if (photo.alt) {{
-                popupContent += '<br>Alt: ' + photo.alt.toFixed(1) + 'm';
-            }}
-            popupContent += '</div>';
-
-            marker.bindPopup(popupContent);
-            marker.addTo(map);
-            markers.push(marker);
-        }});
-
-        // Fit map to show all markers with padding
-        var bounds = L.latLngBounds(photos.map(p => [p.lat, p.lon]));
-        map.fitBounds(bounds, {{ padding: [50, 50] }});
-
-        // Add scale control
-        L.control.scale({{ imperial: true, metric: true }}).addTo(map);
-
-        console.log('Coverage map loaded: ' + photos.length + ' photos');
-    </script>
-</body>
-</html>"""
+        avg_lat, avg_lon = coords[:, :2].mean(axis=0).tolist()
+        min_lat, min_lon = coords[:, :2].min(axis=0).tolist()
+        max_lat, max_lon = coords[:, :2].max(axis=0).tolist()
+        # A degree of longitude shrinks with cos(latitude)
+        meters_per_degree_lon = 111000 * math.cos(math.radians(avg_lat))
+
+        # Photos go in sibling scripts loaded after the map has painted, so a
+        # large mission never blocks first render on parsing inline JSON.
+        # Script tags (not fetch) keep the map working from file:// URLs.
+        # Positions ship as base64 float64 pairs decoded straight into a
+        # Float64Array; names/altitudes are only loaded when a popup opens.
+        # The payloads are written between their call wrappers rather than
+        # concatenated, so no second multi-MB copy is built
+        latlon = np.ascontiguousarray(coords[:, :2], dtype='<f8')
+        photos_file = self.report_dir / "coverage_photos.js"
+        with open(photos_file, 'wb') as f:
+            f.writelines((b'addPhotoCoords("', base64.b64encode(latlon.data), b'");\n'))
+
+        meta_file = self.report_dir / "coverage_photos_meta.js"
+        with open(meta_file, 'wb') as f:
+            f.writelines((b'setPhotoMeta(', _json_bytes({
+                'alt': np.ascontiguousarray(coords[:, 2]),
+                'name': [img['filename'] for img in gps_images]
+            }), b');\n'))
+
+        html_content = _render_template('coverage_map.html', {
+            'photoCount': len(gps_images),
+            'coverage': f"{abs(max_lat - min_lat) * 111000:.0f}m × "
+                        f"{abs(max_lon - min_lon) * meters_per_degree_lon:.0f}m",
+            'center': f"{avg_lat:.6f}, {avg_lon:.6f}",
+            'bounds': [[min_lat, min_lon], [max_lat, max_lon]],
+            'photosUrl': photos_file.name,
+            'photoMetaUrl': meta_file.name
+        })
 
         map_file = self.report_dir / "coverage_map.html"
-        with open(map_file, 'w') as f:
-            f.write(html_content)
+        map_file.write_text(html_content, encoding='utf-8', newline='\n')
 
         print(f"  Coverage map saved to: {map_file}")
         print(f"  Open with: open {map_file}")
 
-    def create_tiled_viewer(self, tiles_dir: Path) -> Path:
-        """Create interactive HTML viewer for tiled orthomosaic"""
+    @staticmethod
+    def read_tile_bounds(tiles_dir: Path) -> Optional[List[List[float]]]:
+        """
+        Return [[south, west], [north, east]] for a gdal2tiles output dir
+        Uses tilemapresource.xml when present, otherwise the XYZ indices of
+        the coarsest zoom level
+        """
+        tilemap_file = tiles_dir / 'tilemapresource.xml'
+        if tilemap_file.exists():
+            try:
+                bbox = ET.parse(tilemap_file).getroot().find('BoundingBox')
+                # gdal2tiles writes latitudes as minx/maxx, longitudes as miny/maxy
+                return [[float(bbox.get('minx')), float(bbox.get('miny'))],
+                        [float(bbox.get('maxx')), float(bbox.get('maxy'))]]
+            except (ET.ParseError, AttributeError, TypeError, ValueError):
+                pass
+
+        if not tiles_dir.exists():
+            return None
+        zooms = [int(d.name) for d in os.scandir(tiles_dir) if d.is_dir() and d.name.isdigit()]
+        if not zooms:
+            return None
+        zoom = min(zooms)
+        zoom_dir = tiles_dir / str(zoom)
+        xs, ys = [], []
+        for x_dir in os.scandir(zoom_dir):
+            if x_dir.is_dir() and x_dir.name.isdigit():
+                xs.append(int(x_dir.name))
+                ys.extend(int(tile.name.split('.')[0]) for tile in os.scandir(x_dir.path)
+                          if tile.name.split('.')[0].isdigit())
+        if not xs or not ys:
+            return None
+
+        n = 2 ** zoom
+        def tile_lat(y):
+            return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+        # XYZ rows count down from the north edge
+        return [[tile_lat(max(ys) + 1), min(xs) / n * 360.0 - 180.0],
+                [tile_lat(min(ys)), (max(xs) + 1) / n * 360.0 - 180.0]]
 
-        # Get mission name from output directory
-        mission_name = self.output_dir.parent.name if self.output_dir.parent.name != 'outputs' else 'Orthomosaic'
+    def create_tiled_viewer(self, tiles_dir: Path, cog_path: Path = None) -> Path:
+        """Create interactive HTML viewer for tiled orthomosaic (or a COG)"""
 
-        # Calculate approximate bounds from tiles directory structure
-        # Parse tilemapresource.xml if exists, otherwise use default
+        # Bake the real bounds in so the first view is already on the mosaic
+        bounds = None if cog_path else self.read_tile_bounds(tiles_dir)
         bounds_center = [0, 0]
         bounds_zoom = 15
-
-        html_content = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{mission_name} - Tiled Orthomosaic Viewer</title>
-
-    <!-- Leaflet CSS -->
-    <link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css" />
-
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            background: #1a1a1a;
-            color: #ffffff;
-        }}
-
-        #header {{
-            background: #2d2d2d;
-            padding: 15px 20px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.3);
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            flex-wrap: wrap;
-            gap: 15px;
-        }}
-
-        #header h1 {{
-            font-size: 24px;
-            font-weight: 600;
-            color: #4CAF50;
-        }}
-
-        .badge {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 4px 12px;
-            border-radius: 12px;
-            font-size: 12px;
-            font-weight: 600;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-        }}
-
-        #mission-info {{
-            display: flex;
-            gap: 20px;
-            flex-wrap: wrap;
-            font-size: 14px;
-        }}
-
-        .info-item {{
-            background: #3d3d3d;
-            padding: 5px 12px;
-            border-radius: 4px;
-        }}
-
-        .info-label {{
-            color: #999;
-            margin-right: 5px;
-        }}
-
-        .info-value {{
-            color: #fff;
-            font-weight: 500;
-        }}
-
-        #map {{
-            width: 100%;
-            height: calc(100vh - 80px);
-        }}
-
-        #coordinates {{
-            position: absolute;
-            bottom: 10px;
-            right: 10px;
-            background: rgba(45, 45, 45, 0.95);
-            padding: 10px 15px;
-            border-radius: 6px;
-            font-family: monospace;
-            font-size: 13px;
-            z-index: 1000;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.3);
-        }}
-
-        .controls {{
-            display: flex;
-            gap: 10px;
-            align-items: center;
-        }}
-
-        .btn {{
-            background: #4CAF50;
-            color: white;
-            border: none;
-            padding: 8px 16px;
-            border-radius: 4px;
-            cursor: pointer;
-            font-size: 14px;
-            transition: background 0.3s;
-        }}
-
-        .btn:hover {{
-            background: #45a049;
-        }}
-
-        .btn-secondary {{
-            background: #555;
-        }}
-
-        .btn-secondary:hover {{
-            background: #666;
-        }}
-
-        #opacity-control {{
-            display: flex;
-            align-items: center;
-            gap: 10px;
-        }}
-
-        #opacity-slider {{
-            width: 150px;
-        }}
-
-        .leaflet-control-attribution {{
-            background: rgba(45, 45, 45, 0.9) !important;
-            color: #999 !important;
-        }}
-
-        .leaflet-control-attribution a {{
-            color: #4CAF50 !important;
-        }}
-
-        /* Hide Leaflet Ukraine flag */
-        .leaflet-control-attribution a[href*="ukraine"] {{
-            display: none !important;
-        }}
-
-        /* Performance indicator */
-        #perf-indicator {{
-            position: absolute;
-            top: 10px;
-            right: 10px;
-            background: rgba(76, 175, 80, 0.9);
-            color: white;
-            padding: 8px 12px;
-            border-radius: 4px;
-            font-size: 12px;
-            font-weight: 600;
-            z-index: 1000;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.3);
-        }}
-    </style>
-</head>
-<body>
-    <div id="header">
-        <div style="display: flex; align-items: center; gap: 10px;">
-            <h1>🗺️ {mission_name}</h1>
-            <span class="badge">Tiled</span>
-        </div>
-        <div id="mission-info">
-            <div class="info-item">
-                <span class="info-label">Mode:</span>
-                <span class="info-value">Fast Tile Loading</span>
-            </div>
-        </div>
-        <div class="controls">
-            <div id="opacity-control">
-                <label for="opacity-slider">Opacity:</label>
-                <input type="range" id="opacity-slider" min="0" max="100" value="100">
-                <span id="opacity-value">100%</span>
-            </div>
-            <button class="btn btn-secondary" onclick="resetView()">Reset View</button>
-        </div>
-    </div>
-
-    <div id="perf-indicator">⚡ Fast Tiles</div>
-    <div id="map"></div>
-
-    <div id="coordinates">
-        <div>Lat: <span id="lat">--</span></div>
-        <div>Lon: <span id="lon">--</span></div>
-        <div>Zoom: <span id="zoom">--</span></div>
-    </div>
-
-    <!-- Leaflet JS -->
-    <script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
-
-    <script>
-        // Initialize map
-        const map = L.map('map', {{
-            center: {bounds_center},
-            zoom: {bounds_zoom},
-            zoomControl: true,
-            attributionControl: true,
-            maxZoom: 22
-        }});
-
-        // Add base layer (OpenStreetMap)
-        const baseLayer = L.tileLayer('https://{{s}}.tile.openstreetmap.org/{{z}}/{{x}}/{{y}}.png', {{
-            attribution: '© OpenStreetMap contributors',
-            maxZoom: 19
-        }}).addTo(map);
-
-        // Add orthomosaic tile layer
-        const orthomosaicLayer = L.tileLayer('tiles/{{z}}/{{x}}/{{y}}.png', {{
-            attribution: 'Orthomosaic © Drone Mapping',
-            maxZoom: 22,
-            tms: false,  // XYZ tile scheme (not TMS)
-            opacity: 1.0
-        }}).addTo(map);
-
-        let initialBounds = null;
-
-        // Update coordinate display
-        map.on('mousemove', function(e) {{
-            document.getElementById('lat').textContent = e.latlng.lat.toFixed(6);
-            document.getElementById('lon').textContent = e.latlng.lng.toFixed(6);
-        }});
-
-        map.on('zoomend', function() {{
-            document.getElementById('zoom').textContent = map.getZoom();
-        }});
-
-        // Opacity control
-        const opacitySlider = document.getElementById('opacity-slider');
-        const opacityValue = document.getElementById('opacity-value');
-
-        opacitySlider.addEventListener('input', function() {{
-            const opacity = this.value / 100;
-            opacityValue.textContent = this.value + '%';
-            orthomosaicLayer.setOpacity(opacity);
-        }});
-
-        // Reset view function
-        function resetView() {{
-            if (initialBounds) {{
-                map.fitBounds(initialBounds);
-            }} else {{
-                map.setView({bounds_center}, {bounds_zoom});
-            }}
-        }}
-
-        // Try to auto-detect bounds from first loaded tiles
-        let boundsDetected = false;
-        orthomosaicLayer.on('tileload', function(e) {{
-            if (!boundsDetected) {{
-                // Get current map bounds as initial bounds
-                initialBounds = map.getBounds();
-                boundsDetected = true;
-            }}
-        }});
-
-        // Set initial zoom display
-        document.getElementById('zoom').textContent = map.getZoom();
-
-        console.log('Tiled viewer loaded successfully!');
-        console.log('Tile URL pattern: tiles/{{z}}/{{x}}/{{y}}.png');
-
-        // Remove Leaflet attribution link
-        setTimeout(function() {{
-            const leafletLink = document.querySelector('.leaflet-control-attribution a[href*="leafletjs.com"]');
-            if (leafletLink) {{
-                leafletLink.remove();
-            }}
-        }}, 100);
-    </script>
-</body>
-</html>'''
+        if bounds:
+            bounds_center = [(bounds[0][0] + bounds[1][0]) / 2, (bounds[0][1] + bounds[1][1]) / 2]
+
+        html_content = _render_template('tiled_viewer.html', {
+            'mission': self.mission_name,
+            'center': bounds_center,
+            'zoom': bounds_zoom,
+            'bounds': bounds,
+            'tileUrl': f'tiles/{{z}}/{{x}}/{{y}}{self.tile_ext}',
+            'cogUrl': cog_path.name if cog_path else None
+        })
 
         viewer_file = self.output_dir / "tiled_viewer.html"
-        with open(viewer_file, 'w') as f:
-            f.write(html_content)
+        viewer_file.write_text(html_content, encoding='utf-8', newline='\n')
 
         print(f"\n✅ Tiled viewer created: {viewer_file}")
         return viewer_file
 
-    def create_web_package(self, tiles_dir: Path, orthophoto_path: Path) -> Path:
-        """Create deployment-ready web package with tiles"""
+    def create_web_package(self, tiles_dir: Path, orthophoto_path: Path,
+                           cog_path: Path = None) -> Path:
+        """Create deployment-ready web package with tiles (or a single COG)"""
         web_package_dir = self.output_dir / "web_package"
         web_package_dir.mkdir(parents=True, exist_ok=True)
 
         print(f"\n📦 Creating web deployment package...")
 
-        # Copy tiles to web package
+        # Copy tiles (or the COG) to web package
         package_tiles_dir = web_package_dir / "tiles"
-        if package_tiles_dir.exists():
-            shutil.rmtree(package_tiles_dir)
-
-        print(f"   Copying tiles...")
-        shutil.copytree(tiles_dir, package_tiles_dir)
+        old_tiles_dir = web_package_dir / "tiles.old"
+
+        # Clear stragglers left by a run that crashed mid-swap. A crash
+        # between the two renames leaves only tiles.old: that is still the
+        # published tree, so put it back rather than deleting it
+        for straggler in web_package_dir.glob("tiles.new.*"):
+            shutil.rmtree(straggler, ignore_errors=True)
+        if old_tiles_dir.exists() and not package_tiles_dir.exists():
+            os.rename(old_tiles_dir, package_tiles_dir)
+        shutil.rmtree(old_tiles_dir, ignore_errors=True)
+
+        if cog_path:
+            print(f"   Linking COG...")
+            fast_copy(cog_path, web_package_dir / cog_path.name)
+            if package_tiles_dir.exists():
+                shutil.rmtree(package_tiles_dir)
+        else:
+            # Hardlink each tile into a sibling directory (reflink or copy
+            # across filesystems), then swap it in with renames so the package
+            # never holds a partial tile tree. Sharing inodes is safe because
+            # tiles are only written into a freshly emptied pyramid (see
+            # generate_tiles_from_geotiff), never over a linked file.
+            # The swap is two renames, so for that instant tiles/ is absent
+            # (requests 404 rather than see a mix of old and new tiles)
+            print(f"   Linking tiles...")
+            new_tiles_dir = web_package_dir / f"tiles.new.{os.getpid()}"
+            shutil.copytree(tiles_dir, new_tiles_dir, copy_function=fast_copy)
+            if package_tiles_dir.exists():
+                os.rename(package_tiles_dir, old_tiles_dir)
+            os.rename(new_tiles_dir, package_tiles_dir)
+            shutil.rmtree(old_tiles_dir, ignore_errors=True)
 
         # Create index.html (tiled viewer)
-        mission_name = self.output_dir.parent.name if self.output_dir.parent.name != 'outputs' else 'Orthomosaic'
-
-        index_html = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{mission_name} - Orthomosaic Map</title>
-    <link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css" />
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; }}
-        #map {{ width: 100%; height: 100vh; }}
-
-        #controls {{
-            position: absolute;
-            top: 10px;
-            left: 60px;
-            background: white;
-            padding: 15px 20px;
-            border-radius: 8px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.2);
-            z-index: 1000;
-            display: flex;
-            align-items: center;
-            gap: 20px;
-            flex-wrap: wrap;
-        }}
-
-        #controls h2 {{
-            margin: 0;
-            font-size: 18px;
-            color: #333;
-        }}
-
-        .badge {{
-            background: #4CAF50;
-            color: white;
-            padding: 3px 10px;
-            border-radius: 12px;
-            font-size: 11px;
-            font-weight: 600;
-        }}
-
-        .control-group {{
-            display: flex;
-            align-items: center;
-            gap: 10px;
-        }}
-
-        .control-group label {{
-            font-size: 14px;
-            color: #666;
-            font-weight: 500;
-        }}
-
-        #opacity-slider {{
-            width: 120px;
-            height: 6px;
-            cursor: pointer;
-        }}
-
-        #opacity-value {{
-            font-size: 14px;
-            color: #333;
-            font-weight: 600;
-            min-width: 45px;
-        }}
-
-        .btn {{
-            background: #4CAF50;
-            color: white;
-            border: none;
-            padding: 8px 16px;
-            border-radius: 6px;
-            cursor: pointer;
-            font-size: 14px;
-            font-weight: 500;
-            transition: background 0.2s;
-        }}
-
-        .btn:hover {{
-            background: #45a049;
-        }}
-
-        #coordinates {{
-            position: absolute;
-            bottom: 10px;
-            right: 10px;
-            background: rgba(255, 255, 255, 0.95);
-            padding: 10px 15px;
-            border-radius: 6px;
-            font-family: monospace;
-            font-size: 13px;
-            z-index: 1000;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.2);
-        }}
-
-        #coordinates div {{
-            margin: 2px 0;
-            color: #333;
-        }}
-
-        #coordinates span {{
-            font-weight: 600;
-            color: #4CAF50;
-        }}
-
-        /* Hide Leaflet Ukraine flag */
-        .leaflet-control-attribution a[href*="ukraine"] {{
-            display: none !important;
-        }}
-    </style>
-</head>
-<body>
-    <div id="controls">
-        <h2>🗺️ {mission_name}</h2>
-        <span class="badge">Interactive Map</span>
-
-        <div class="control-group">
-            <label for="opacity-slider">Opacity:</label>
-            <input type="range" id="opacity-slider" min="0" max="100" value="100">
-            <span id="opacity-value">100%</span>
-        </div>
-
-        <button class="btn" onclick="resetView()">Reset View</button>
-    </div>
-
-    <div id="map"></div>
-
-    <div id="coordinates">
-        <div>Lat: <span id="lat">--</span></div>
-        <div>Lon: <span id="lon">--</span></div>
-        <div>Zoom: <span id="zoom">--</span></div>
-    </div>
-
-    <script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
-    <script>
-        // Initialize map
-        const map = L.map('map').setView([0, 0], 15);
-
-        // Add base layer
-        L.tileLayer('https://{{s}}.tile.openstreetmap.org/{{z}}/{{x}}/{{y}}.png', {{
-            attribution: '© OpenStreetMap contributors',
-            maxZoom: 19
-        }}).addTo(map);
-
-        // Add orthomosaic layer
-        const orthomosaicLayer = L.tileLayer('tiles/{{z}}/{{x}}/{{y}}.png', {{
-            attribution: 'Orthomosaic © Drone Mapping',
-            maxZoom: 22,
-            opacity: 1.0
-        }}).addTo(map);
-
-        // Add scale control
-        L.control.scale({{ imperial: true, metric: true }}).addTo(map);
-
-        // Opacity control
-        const opacitySlider = document.getElementById('opacity-slider');
-        const opacityValue = document.getElementById('opacity-value');
-
-        opacitySlider.addEventListener('input', function() {{
-            const opacity = this.value / 100;
-            opacityValue.textContent = this.value + '%';
-            orthomosaicLayer.setOpacity(opacity);
-        }});
-
-        // Update coordinate display
-        map.on('mousemove', function(e) {{
-            document.getElementById('lat').textContent = e.latlng.lat.toFixed(6);
-            document.getElementById('lon').textContent = e.latlng.lng.toFixed(6);
-        }});
-
-        map.on('zoomend', function() {{
-            document.getElementById('zoom').textContent = map.getZoom();
-        }});
-
-        // Set initial zoom display
-        document.getElementById('zoom').textContent = map.getZoom();
-
-        // Reset view function
-        function resetView() {{
-            map.setView([0, 0], 15);
-        }}
-
-        // Remove Leaflet attribution link
-        setTimeout(function() {{
-            const leafletLink = document.querySelector('.leaflet-control-attribution a[href*="leafletjs.com"]');
-            if (leafletLink) {{
-                leafletLink.remove();
-            }}
-        }}, 100);
-    </script>
-</body>
-</html>'''
-
-        with open(web_package_dir / "index.html", 'w') as f:
-            f.write(index_html)
+        index_html = _render_template('web_package_index.html', {
+            'mission': self.mission_name,
+            'bounds': None if cog_path else self.read_tile_bounds(tiles_dir),
+            'tileUrl': f'tiles/{{z}}/{{x}}/{{y}}{self.tile_ext}',
+            'cogUrl': cog_path.name if cog_path else None
+        })
+
+        _write_precompressed(web_package_dir / "index.html", index_html.encode())
 
         # Create README
-        readme_content = f'''# {mission_name} - Web Deployment Package
+        if cog_path:
+            contents_line = f"- `{cog_path.name}` - Cloud-Optimized GeoTIFF (streamed with HTTP range requests)"
+            size_lines = f"COG size: {cog_path.stat().st_size / (1024*1024):.1f} MB"
+        else:
+            contents_line = "- `tiles/` - Map tiles (XYZ format)"
+            tile_count, total_size = self._tile_stats(package_tiles_dir)
+            size_lines = f'''Total tiles: {tile_count:,} files
+Total size: {total_size / (1024*1024):.1f} MB'''
+
+        readme_content = f'''# {self.mission_name} - Web Deployment Package
 
 ## Contents
 
 - `index.html` - Interactive map viewer
-- `tiles/` - Map tiles (XYZ format)
+{contents_line}
 
 ## Deployment Instructions
 
 ### Option 1: Simple Web Server
 
 Upload this entire folder to any web server. No backend required!
+A COG package needs a server that honours HTTP Range requests (nginx,
+Apache, S3, `npx http-server`); Python's http.server does not.
 
 ### Option 2: Local Testing
 
@@ -1441,8 +1724,7 @@ Upload to:
 
 ## File Size
 
-Total tiles: {sum(1 for _ in package_tiles_dir.rglob('*.png')):,} files
-Total size: {sum(f.stat().st_size for f in package_tiles_dir.rglob('*.png')) / (1024*1024):.1f} MB
+{size_lines}
 
 ## Performance
 
@@ -1456,15 +1738,61 @@ Total size: {sum(f.stat().st_size for f in package_tiles_dir.rglob('*.png')) / (
 Generated by Drone Mapping Utility Suite
 '''
 
-        with open(web_package_dir / "README.md", 'w') as f:
-            f.write(readme_content)
+        _write_precompressed(web_package_dir / "README.md", readme_content.encode())
+
+        # PNG/WebP tiles are already compressed; only the TMS metadata benefits
+        tilemap_xml = package_tiles_dir / "tilemapresource.xml"
+        if not cog_path and tilemap_xml.exists():
+            _write_precompressed(tilemap_xml, tilemap_xml.read_bytes())
 
         print(f"   ✅ Web package created: {web_package_dir}")
-        print(f"   📄 Files: index.html, tiles/, README.md")
+        print(f"   📄 Files: index.html, {cog_path.name if cog_path else 'tiles/'}, README.md")
 
         return web_package_dir
 
-def main():
+def run_pipeline(input_dir: str, output_dir: str, use_odm: bool = False,
+                 simple_mosaic: bool = False, resume: bool = False,
+                 jobs: Optional[int] = None, cog: bool = False,
+                 frame_size: Optional[Tuple[int, int]] = None) -> bool:
+    """Scan images, build the map (ODM or simple mosaic) and write the report"""
+    processor = ImageProcessor(input_dir, output_dir, jobs=jobs, cog=cog, frame_size=frame_size)
+
+    # Prepare images and extract metadata
+    image_info = processor.prepare_images()
+
+    if not image_info:
+        print("No images found to process!")
+        return False
+
+    processing_success = False
+
+    # Try OpenDroneMap if requested
+    if use_odm:
+        # Determine project name - use the most recent existing one if resuming
+        project_name = f"mapping_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        if resume:
+            odm_projects_dir = processor.output_dir / "odm_project"
+            existing_projects = sorted(os.listdir(odm_projects_dir)) if odm_projects_dir.exists() else []
+            if existing_projects:
+                project_name = existing_projects[-1]  # Timestamped names sort oldest first
+                print(f"Found existing project: {project_name}")
+            else:
+                print("Warning: --resume specified but no existing projects found")
+
+        odm_project = processor.create_odm_project(project_name, image_info, resume=resume)
+        processing_success = processor.run_opendronemap(odm_project, resume=resume)
+
+    # Fallback to simple mosaic if requested
+    elif simple_mosaic:
+        image_list = [img['path'] for img in image_info]
+        processing_success = processor.create_simple_mosaic(image_list)
+
+    # Generate report
+    processor.generate_report(image_info, processing_success)
+
+    return processing_success
+
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(description="Process drone images into maps")
     parser.add_argument("input_dir", nargs='?', help="Directory containing drone photos")
     parser.add_argument("--output", default="mapping_output",
@@ -1479,15 +1807,21 @@ def main():
                        help="Show current processing progress")
     parser.add_argument("--generate-tiles", type=str, metavar="GEOTIFF_PATH",
                        help="Generate web tiles from existing GeoTIFF orthomosaic")
+    parser.add_argument("--cog", action="store_true",
+                       help="Publish a Cloud-Optimized GeoTIFF instead of a PNG tile pyramid")
+    parser.add_argument("--jobs", type=int, default=None,
+                       help="Worker processes for image scanning (default: CPU count)")
+    parser.add_argument("--frame-size", type=str, metavar="WxH",
+                       help="Only process JPEGs of this frame size, e.g. 4000x3000 (default: keep all)")
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # If just checking progress, show it and exit
     if args.progress:
         if not Path(args.output).exists():
             print("Error: Output directory does not exist")
             return
-        processor = ImageProcessor(".", args.output)  # Dummy input_dir
+        processor = ImageProcessor.for_output(args.output)
         processor.print_progress_summary()
         return
 
@@ -1497,59 +1831,33 @@ def main():
         if not geotiff_path.exists():
             print(f"Error: GeoTIFF not found: {geotiff_path}")
             return
-        processor = ImageProcessor(".", args.output)  # Dummy input_dir
-        tiles_success = processor.generate_tiles_from_geotiff(geotiff_path)
+        processor = ImageProcessor.for_output(args.output, jobs=args.jobs, cog=args.cog)
+        tiles_dir = processor.output_dir / "tiles"
+        cog_path = processor.output_dir / "orthophoto_cog.tif" if args.cog else None
+        if cog_path:
+            tiles_success = processor.generate_cog(geotiff_path, cog_path)
+        else:
+            tiles_success = processor.generate_tiles_from_geotiff(geotiff_path)
         if tiles_success:
-            processor.create_tiled_viewer(processor.output_dir / "tiles")
-            processor.create_web_package(processor.output_dir / "tiles", geotiff_path)
+            processor.create_tiled_viewer(tiles_dir, cog_path)
+            processor.create_web_package(tiles_dir, geotiff_path, cog_path)
             print("\n✅ Tile generation complete!")
         return
 
     if not args.input_dir:
         parser.error("input_dir is required unless using --progress or --generate-tiles")
 
-    processor = ImageProcessor(args.input_dir, args.output)
-
-    # Prepare images and extract metadata
-    image_info = processor.prepare_images()
-
-    if not image_info:
-        print("No images found to process!")
-        return
-
-    processing_success = False
-
-    # Try OpenDroneMap if requested
-    if args.use_odm:
-        # Determine project name - use existing if resuming
-        if args.resume:
-            # Find existing project
-            odm_projects_dir = processor.output_dir / "odm_project"
-            if odm_projects_dir.exists():
-                existing_projects = list(odm_projects_dir.iterdir())
-                if existing_projects:
-                    project_name = existing_projects[-1].name  # Use most recent
-                    print(f"Found existing project: {project_name}")
-                else:
-                    print("Warning: --resume specified but no existing projects found")
-                    project_name = f"mapping_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            else:
-                print("Warning: --resume specified but no existing projects found")
-                project_name = f"mapping_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        else:
-            project_name = f"mapping_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-
-        odm_project = processor.create_odm_project(project_name, resume=args.resume)
-        processing_success = processor.run_opendronemap(odm_project, resume=args.resume)
-
-    # Fallback to simple mosaic if requested
-    elif args.simple_mosaic:
-        image_list = [str(processor.processed_dir / img['filename'])
-                     for img in image_info]
-        processing_success = processor.create_simple_mosaic(image_list)
-
-    # Generate report
-    processor.generate_report(image_info, processing_success)
+    frame_size = None
+    if args.frame_size:
+        try:
+            width, height = (int(part) for part in args.frame_size.lower().split('x'))
+        except ValueError:
+            parser.error("--frame-size must look like 4000x3000")
+        frame_size = (width, height)
+
+    run_pipeline(args.input_dir, args.output, use_odm=args.use_odm,
+                 simple_mosaic=args.simple_mosaic, resume=args.resume,
+                 jobs=args.jobs, cog=args.cog, frame_size=frame_size)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,6 +4,7 @@ Mission Control Center for Drone Mapping
 Central command interface for all mapping operations
 """
 
+import functools
 import os
 import sys
 import json
@@ -13,30 +14,65 @@ from datetime import datetime
 import subprocess
 from typing import Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Fall back to the standard library json module
+
+def _json_bytes_indented(value) -> bytes:
+    """Serialize a JSON value indented for reading by hand"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2)
+    return json.dumps(value, indent=2).encode('utf-8')
+
+def _json_loads(data: bytes):
+    """Parse JSON bytes with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 class MissionControl:
     def __init__(self, mission_name: str = None, drone_profile: str = None, area_m2: int = None):
         self.mission_name = mission_name or f"Mission_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         self.mission_dir = Path(f"missions/{self.mission_name}")
-        self.mission_dir.mkdir(parents=True, exist_ok=True)
-
-        # Create mission subdirectories
-        self.plans_dir = self.mission_dir / "flight_plans"
-        self.images_dir = self.mission_dir / "captured_images"
-        self.outputs_dir = self.mission_dir / "outputs"
-        self.logs_dir = self.mission_dir / "logs"
-
-        for dir in [self.plans_dir, self.images_dir, self.outputs_dir, self.logs_dir]:
-            dir.mkdir(parents=True, exist_ok=True)
-
         self.config = self.load_or_create_config(drone_profile, area_m2)
 
+    def _mission_subdir(self, name: str) -> Path:
+        """Mission subdirectory, (re)created on first use"""
+        path = self.mission_dir / name
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    # Subdirectories are laid out when a mission is created; afterwards each
+    # is only touched by the actions that use it, so summary does no mkdirs
+    @functools.cached_property
+    def plans_dir(self) -> Path:
+        """Generated flight plans"""
+        return self._mission_subdir("flight_plans")
+
+    @functools.cached_property
+    def images_dir(self) -> Path:
+        """Drone photos to process"""
+        return self._mission_subdir("captured_images")
+
+    @functools.cached_property
+    def outputs_dir(self) -> Path:
+        """Processed maps and reports"""
+        return self._mission_subdir("outputs")
+
+    @functools.cached_property
+    def logs_dir(self) -> Path:
+        """Mission logs"""
+        return self._mission_subdir("logs")
+
     def load_or_create_config(self, drone_profile: str = None, area_m2: int = None) -> Dict:
         """Load or create mission configuration"""
         config_file = self.mission_dir / "mission_config.json"
 
-        if config_file.exists():
-            with open(config_file, 'r') as f:
-                return json.load(f)
+        try:
+            return _json_loads(config_file.read_bytes())
+        except FileNotFoundError:
+            pass
 
         # Default configuration - generic mapping mission
         config = {
@@ -64,8 +100,10 @@ class MissionControl:
             }
         }
 
-        with open(config_file, 'w') as f:
-            json.dump(config, f, indent=2)
+        # New mission: create the directory layout along with its config
+        for subdir in ("flight_plans", "captured_images", "outputs", "logs"):
+            self._mission_subdir(subdir)
+        config_file.write_bytes(_json_bytes_indented(config))
 
         return config
 
@@ -75,19 +113,12 @@ class MissionControl:
         print("🚁 RUNNING PREFLIGHT CHECKS")
         print("="*60)
 
-        cmd = [
-            sys.executable,
-            'preflight_checklist.py',
-            '--lat', str(lat),
-            '--lon', str(lon)
-        ]
+        from preflight_checklist import run_checks
 
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            print(result.stdout)
+            report = run_checks(lat, lon)
 
-            # Check for errors in output
-            if "NO GO" in result.stdout:
+            if not report['go_no_go']:
                 print("\n❌ Preflight checks failed. Resolve issues before proceeding.")
                 return False
 
@@ -111,20 +142,13 @@ class MissionControl:
 
         output_file = self.plans_dir / f"flight_plan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
 
-        cmd = [
-            sys.executable,
-            'flight_planner.py',
-            '--drone', self.config.get('drone_profile', 'potensic_atom_2'),
-            '--center-lat', str(center_lat),
-            '--center-lon', str(center_lon),
-            '--area-size', str(area_size),
-            '--altitude', str(self.config['mapping_parameters']['altitude_m']),
-            '--output', str(output_file)
-        ]
+        from flight_planner import plan_mission
 
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            print(result.stdout)
+            plan_mission(self.config.get('drone_profile', 'potensic_atom_2'),
+                         center_lat, center_lon, area_size,
+                         self.config['mapping_parameters']['altitude_m'],
+                         str(output_file))
 
             if output_file.exists():
                 print(f"\n✅ Flight plan saved to: {output_file}")
@@ -143,29 +167,55 @@ class MissionControl:
         print("👀 MONITORING ODM PROCESSING")
         print("="*60)
 
+        # The SDK pulls in requests/urllib3, so only load it when monitoring
         try:
-            # Find running ODM container
-            result = subprocess.run(
-                ['docker', 'ps', '--filter', 'ancestor=opendronemap/odm', '--format', '{{.ID}} {{.Names}}'],
-                capture_output=True,
-                text=True
-            )
-
-            if not result.stdout.strip():
+            import docker
+        except ImportError:
+            docker = None  # Fall back to the docker CLI
+
+        try:
+            # Find running ODM container (over the Docker API socket when the
+            # SDK is installed, saving two docker CLI process launches)
+            if docker is not None:
+                try:
+                    client = docker.from_env()
+                    containers = client.containers.list(filters={'ancestor': 'opendronemap/odm'})
+                    found = [(c.id, c.name) for c in containers]
+                except docker.errors.DockerException as e:
+                    # SDK installed but the daemon is not reachable through it
+                    # (e.g. a non-default context or socket): use the CLI instead
+                    print(f"⚠️  Docker SDK could not connect ({e}); using the docker CLI")
+                    docker = None
+            if docker is None:
+                result = subprocess.run(
+                    ['docker', 'ps', '--filter', 'ancestor=opendronemap/odm', '--format', '{{.ID}} {{.Names}}'],
+                    capture_output=True,
+                    text=True
+                )
+                found = []
+                if result.stdout.strip():
+                    fields = result.stdout.strip().split()
+                    found.append((fields[0], fields[1] if len(fields) > 1 else fields[0]))
+
+            if not found:
                 print("❌ No active ODM containers found")
                 print("\nTip: Start processing first with:")
                 print(f"  python mission_control.py --mission {self.mission_name} --action process --use-odm")
                 return
 
-            container_id = result.stdout.strip().split()[0]
-            container_name = result.stdout.strip().split()[1] if len(result.stdout.strip().split()) > 1 else container_id
+            container_id, container_name = found[0]
 
             print(f"✅ Found ODM container: {container_name} ({container_id[:12]})")
             print("\nStreaming logs (Ctrl+C to stop)...\n")
             print("="*60)
 
             # Tail the logs
-            subprocess.run(['docker', 'logs', '-f', container_id])
+            if docker is not None:
+                for chunk in containers[0].logs(stream=True, follow=True):
+                    sys.stdout.buffer.write(chunk)
+                    sys.stdout.buffer.flush()
+            else:
+                subprocess.run(['docker', 'logs', '-f', container_id])
 
         except KeyboardInterrupt:
             print("\n\n" + "="*60)
@@ -185,24 +235,14 @@ class MissionControl:
             print(f"   Please place images in: {self.images_dir}")
             return False
 
-        cmd = [
-            sys.executable,
-            'image_processor.py',
-            str(self.images_dir),
-            '--output', str(self.outputs_dir)
-        ]
-
-        if use_odm:
-            cmd.append('--use-odm')
-            if resume:
-                cmd.append('--resume')
-        else:
-            cmd.append('--simple-mosaic')
+        from image_processor import run_pipeline
 
         try:
-            # Stream output in real-time instead of capturing it
-            result = subprocess.run(cmd, text=True)
-            return result.returncode == 0
+            # Run in-process: no second interpreter start-up or re-import of
+            # numpy/exifread, and the whole pipeline profiles as one process
+            return run_pipeline(str(self.images_dir), str(self.outputs_dir),
+                                use_odm=use_odm, simple_mosaic=not use_odm,
+                                resume=use_odm and resume)
 
         except Exception as e:
             print(f"Error processing images: {e}")
@@ -214,23 +254,25 @@ class MissionControl:
         print("📊 PROCESSING PROGRESS")
         print("="*60)
 
-        cmd = [
-            sys.executable,
-            'image_processor.py',
-            '--output', str(self.outputs_dir),
-            '--progress'
-        ]
+        from image_processor import ImageProcessor
+
+        # Not self.outputs_dir: that property creates the directory
+        outputs_dir = self.mission_dir / "outputs"
+        if not outputs_dir.exists():
+            print("Error: Output directory does not exist")
+            return False
 
         try:
-            result = subprocess.run(cmd, text=True)
-            return result.returncode == 0
+            ImageProcessor.for_output(str(outputs_dir)).print_progress_summary()
+            return True
 
         except Exception as e:
             print(f"Error checking progress: {e}")
             return False
 
-    def estimate_mission_stats(self) -> Dict:
-        """Estimate mission statistics based on area and drone specs"""
+    @functools.cached_property
+    def mission_stats(self) -> Dict:
+        """Estimated mission statistics based on area and drone specs (computed once)"""
         # Get total area from config
         total_area = self.config.get('estimated_area_m2', 160000)
 
@@ -278,7 +320,7 @@ class MissionControl:
 
     def print_mission_summary(self):
         """Print comprehensive mission summary"""
-        stats = self.estimate_mission_stats()
+        stats = self.mission_stats
 
         print("\n" + "="*60)
         print("🗺️  DRONE MAPPING MISSION SUMMARY")
@@ -309,6 +351,7 @@ class MissionControl:
 
     def create_execution_checklist(self):
         """Create detailed execution checklist"""
+        stats = self.mission_stats
         checklist = f"""
 DRONE MAPPING EXECUTION CHECKLIST
 ==================================
@@ -316,8 +359,8 @@ DRONE MAPPING EXECUTION CHECKLIST
 PHASE 1: PREPARATION (Day Before)
 ----------------------------------
 □ Review flight plan and waypoints
-□ Charge all batteries (minimum {self.estimate_mission_stats()['estimated_batteries']})
-□ Format SD cards (need {self.estimate_mission_stats()['storage_required_gb']}GB space)
+□ Charge all batteries (minimum {stats['estimated_batteries']})
+□ Format SD cards (need {stats['storage_required_gb']}GB space)
 □ Check weather forecast
 □ Notify neighbors about drone operations
 □ Test drone and camera functionality
@@ -5,37 +5,103 @@ Ensures safe and legal drone operations
 """
 
 import json
+import os
+import time
+import numpy as np
 import requests
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 import argparse
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Fall back to the standard library json module
+
+def _json_bytes_indented(value) -> bytes:
+    """Serialize a JSON value indented for reading by hand"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2)
+    return json.dumps(value, indent=2).encode('utf-8')
+
+def _json_loads(data: bytes):
+    """Parse JSON bytes with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Airports for the simplified controlled-airspace check (in production, use
+# proper airspace data). Kept as arrays so every airport is tested in one
+# vectorized pass however long the list grows
+MAJOR_AIRPORTS = [
+    {'name': 'JFK', 'lat': 40.6413, 'lon': -73.7781, 'radius_nm': 5},
+    {'name': 'LAX', 'lat': 33.9425, 'lon': -118.4081, 'radius_nm': 5},
+    # Add more airports as needed
+]
+AIRPORT_NAMES = [airport['name'] for airport in MAJOR_AIRPORTS]
+AIRPORT_LAT_RAD = np.radians([airport['lat'] for airport in MAJOR_AIRPORTS])
+AIRPORT_LON_RAD = np.radians([airport['lon'] for airport in MAJOR_AIRPORTS])
+AIRPORT_COS_LAT = np.cos(AIRPORT_LAT_RAD)  # Haversine term fixed per airport
+AIRPORT_RADIUS_NM = np.array([airport['radius_nm'] for airport in MAJOR_AIRPORTS], dtype=np.float64)
+
+EARTH_RADIUS_NM = 3440.065
+
+# Weather responses are reused for this long per ~1 km grid cell, so repeated
+# preflight runs during a flight session skip the network
+WEATHER_CACHE_DIR = Path.home() / ".sky_forge_cache"
+WEATHER_CACHE_TTL_S = 600
+
 class PreflightChecker:
+    # One session for all checkers keeps the TCP/TLS connection alive
+    _session = requests.Session()
+
     def __init__(self, location: Tuple[float, float]):
         self.latitude, self.longitude = location
         self.checks = []
         self.warnings = []
         self.errors = []
 
+    def _fetch_weather(self, api_key: str) -> Optional[Dict]:
+        """Current OpenWeatherMap conditions, reusing a cached response under 10 minutes old"""
+        cache_file = WEATHER_CACHE_DIR / f"weather_{self.latitude:.2f}_{self.longitude:.2f}.json"
+        try:
+            if time.time() - cache_file.stat().st_mtime < WEATHER_CACHE_TTL_S:
+                return _json_loads(cache_file.read_bytes())
+        except (OSError, ValueError):
+            pass
+
+        url = f"https://api.openweathermap.org/data/2.5/weather"
+        params = {
+            'lat': self.latitude,
+            'lon': self.longitude,
+            'appid': api_key,
+            'units': 'metric'
+        }
+        response = self._session.get(url, params=params, timeout=(2, 5))
+        if response.status_code != 200:
+            return None
+        data = _json_loads(response.content)
+
+        # Temp file + rename so a concurrent run never reads a partial file
+        try:
+            WEATHER_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix('.json.tmp')
+            tmp_file.write_bytes(response.content)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass  # Caching is best-effort
+        return data
+
     def check_weather(self, api_key: str = None) -> Dict:
         """Check weather conditions for safe flying"""
         print("\n📋 Checking Weather Conditions...")
 
         if api_key:
             # Use OpenWeatherMap API if key provided
-            url = f"https://api.openweathermap.org/data/2.5/weather"
-            params = {
-                'lat': self.latitude,
-                'lon': self.longitude,
-                'appid': api_key,
-                'units': 'metric'
-            }
-
             try:
-                response = requests.get(url, params=params, timeout=5)
-                if response.status_code == 200:
-                    data = response.json()
-
+                data = self._fetch_weather(api_key)
+                if data is not None:
                     wind_speed = data['wind']['speed']  # m/s
                     visibility = data.get('visibility', 10000) / 1000  # km
                     weather_desc = data['weather'][0]['description']
@@ -87,25 +153,20 @@ class PreflightChecker:
             'restrictions': []
         }
 
-        # Check for nearby airports (simplified radius check)
-        # In production, use proper airspace data
-        major_airports = [
-            {'name': 'JFK', 'lat': 40.6413, 'lon': -73.7781, 'radius_nm': 5},
-            {'name': 'LAX', 'lat': 33.9425, 'lon': -118.4081, 'radius_nm': 5},
-            # Add more airports as needed
-        ]
-
-        for airport in major_airports:
-            # Calculate distance (simplified)
-            dist_deg = ((self.latitude - airport['lat'])**2 +
-                       (self.longitude - airport['lon'])**2)**0.5
-            dist_nm = dist_deg * 60  # Rough conversion
-
-            if dist_nm < airport['radius_nm']:
-                self.errors.append(f"Within {airport['name']} controlled airspace!")
-                airspace_info['restrictions'].append(f"Airport: {airport['name']}")
-            elif dist_nm < airport['radius_nm'] * 2:
-                self.warnings.append(f"Near {airport['name']} airspace - check NOTAMS")
+        # Great-circle (haversine) distance to every airport at once
+        lat = np.radians(self.latitude)
+        lon = np.radians(self.longitude)
+        h = (np.sin((AIRPORT_LAT_RAD - lat) / 2) ** 2 +
+             np.cos(lat) * AIRPORT_COS_LAT * np.sin((AIRPORT_LON_RAD - lon) / 2) ** 2)
+        dist_nm = 2 * EARTH_RADIUS_NM * np.arcsin(np.sqrt(np.minimum(h, 1.0)))
+
+        inside = dist_nm < AIRPORT_RADIUS_NM
+        near = ~inside & (dist_nm < AIRPORT_RADIUS_NM * 2)
+        for i in np.flatnonzero(inside):
+            self.errors.append(f"Within {AIRPORT_NAMES[i]} controlled airspace!")
+            airspace_info['restrictions'].append(f"Airport: {AIRPORT_NAMES[i]}")
+        for i in np.flatnonzero(near):
+            self.warnings.append(f"Near {AIRPORT_NAMES[i]} airspace - check NOTAMS")
 
         if not airspace_info['restrictions']:
             self.checks.append("✓ No major airspace restrictions detected")
@@ -166,8 +227,9 @@ class PreflightChecker:
 
     def generate_report(self, save_to_file: bool = True) -> Dict:
         """Generate comprehensive preflight report"""
+        now = datetime.now()
         report = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now.isoformat(),
             'location': {
                 'latitude': self.latitude,
                 'longitude': self.longitude
@@ -181,9 +243,9 @@ class PreflightChecker:
         }
 
         if save_to_file:
-            filename = f"preflight_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(filename, 'w') as f:
-                json.dump(report, f, indent=2)
+            filename = f"preflight_report_{now.strftime('%Y%m%d_%H%M%S')}.json"
+            with open(filename, 'wb') as f:
+                f.write(_json_bytes_indented(report))
             print(f"\n📄 Report saved to: {filename}")
 
         return report
@@ -282,24 +344,13 @@ class SafetyMonitor:
 
         return status
 
-def main():
-    parser = argparse.ArgumentParser(description="Drone mapping preflight checker")
-    parser.add_argument("--lat", type=float, required=True,
-                       help="Latitude of flight area")
-    parser.add_argument("--lon", type=float, required=True,
-                       help="Longitude of flight area")
-    parser.add_argument("--weather-api", type=str,
-                       help="OpenWeatherMap API key for weather checks")
-    parser.add_argument("--skip-weather", action="store_true",
-                       help="Skip weather checks")
-
-    args = parser.parse_args()
-
-    # Run preflight checks
-    checker = PreflightChecker((args.lat, args.lon))
+def run_checks(lat: float, lon: float, weather_api: str = None,
+               skip_weather: bool = False) -> Dict:
+    """Run all preflight checks for a location, print the results and return the report"""
+    checker = PreflightChecker((lat, lon))
 
-    if not args.skip_weather:
-        checker.check_weather(args.weather_api)
+    if not skip_weather:
+        checker.check_weather(weather_api)
 
     checker.check_airspace()
     checker.check_time_of_day()
@@ -327,5 +378,21 @@ def main():
     print("  • Have a spotter if flying near obstacles")
     print("  • Land immediately if any issues arise")
 
+    return report
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Drone mapping preflight checker")
+    parser.add_argument("--lat", type=float, required=True,
+                       help="Latitude of flight area")
+    parser.add_argument("--lon", type=float, required=True,
+                       help="Longitude of flight area")
+    parser.add_argument("--weather-api", type=str,
+                       help="OpenWeatherMap API key for weather checks")
+    parser.add_argument("--skip-weather", action="store_true",
+                       help="Skip weather checks")
+
+    args = parser.parse_args(argv)
+    run_checks(args.lat, args.lon, weather_api=args.weather_api, skip_weather=args.skip_weather)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
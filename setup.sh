@@ -11,7 +11,7 @@ if command -v python3 &> /dev/null; then
     PYTHON_VERSION=$(python3 --version | cut -d' ' -f2)
     echo "✓ Python $PYTHON_VERSION found"
 else
-    echo "❌ Python 3 not found. Please install Python 3.8 or higher"
+    echo "❌ Python 3 not found. Please install Python 3.10 or higher"
     exit 1
 fi
 
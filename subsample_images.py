@@ -4,30 +4,35 @@ Subsample images for faster processing
 Use this when you have too many images and want a quick preview orthomosaic
 """
 
-import shutil
+import os
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from fsutil import fast_copy
+
+# Below this many images, links/copies run inline: a thread pool's start-up
+# costs more than it overlaps
+POOL_MIN_IMAGES = 32
+
 def subsample_images(input_dir: str, output_dir: str, keep_every_nth: int = 2):
     """
     Keep every Nth image, useful for reducing processing time
 
     Args:
         input_dir: Directory with all images
-        output_dir: Directory to copy subsampled images to
+        output_dir: Directory to link or copy subsampled images to
         keep_every_nth: Keep every Nth image (2 = keep 50%, 3 = keep 33%, etc.)
     """
     input_path = Path(input_dir)
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    # Get all images sorted by name
-    image_extensions = ['.jpg', '.jpeg', '.JPG', '.JPEG', '.png', '.PNG']
-    all_images = []
-    for ext in image_extensions:
-        all_images.extend(sorted(input_path.glob(f'*{ext}')))
-
-    all_images = sorted(all_images)
+    # Get all images sorted by name, in one directory read (any extension case)
+    image_extensions = ('.jpg', '.jpeg', '.png')
+    with os.scandir(input_path) as it:
+        all_images = sorted(Path(entry.path) for entry in it
+                            if entry.name.lower().endswith(image_extensions) and entry.is_file())
 
     print(f"Found {len(all_images)} total images")
 
@@ -37,9 +42,18 @@ def subsample_images(input_dir: str, output_dir: str, keep_every_nth: int = 2):
     print(f"Keeping {len(kept_images)} images (every {keep_every_nth})")
     print(f"Reduction: {100 * (1 - len(kept_images)/len(all_images)):.1f}%")
 
-    # Copy selected images
-    for img in kept_images:
-        shutil.copy2(img, output_path / img.name)
+    # Link selected images (the processor only reads them); copy only
+    # when the output is on another filesystem
+    same_device = os.stat(input_path).st_dev == os.stat(output_path).st_dev
+    # File I/O releases the GIL, so threads keep several copies in flight
+    if len(kept_images) < POOL_MIN_IMAGES:
+        methods = [fast_copy(img, output_path / img.name, link=same_device) for img in kept_images]
+    else:
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+            methods = list(pool.map(lambda img: fast_copy(img, output_path / img.name, link=same_device),
+                                    kept_images))
+    print(f"Linked {methods.count('linked')}, reflinked {methods.count('reflinked')}, "
+          f"copied {methods.count('copied')} images")
 
     print(f"\nSubsampled images saved to: {output_path}")
     print(f"\nTo process these:")
@@ -0,0 +1,72 @@
+        // Add orthomosaic layer: XYZ tiles, or a Cloud-Optimized GeoTIFF that
+        // is streamed with HTTP range requests once georaster has loaded
+        let orthomosaicLayer;
+        if (CONFIG.cogUrl) {
+            orthomosaicLayer = L.layerGroup().addTo(map);
+            orthomosaicLayer.setOpacity = function(opacity) {
+                this.eachLayer(function(layer) { layer.setOpacity(opacity); });
+            };
+
+            const cogScripts = [
+                'https://unpkg.com/georaster',
+                'https://unpkg.com/georaster-layer-for-leaflet/dist/georaster-layer-for-leaflet.min.js'
+            ];
+            cogScripts.reduce(function(loaded, src) {
+                return loaded.then(function() {
+                    return new Promise(function(resolve, reject) {
+                        const script = document.createElement('script');
+                        script.src = src;
+                        script.onload = resolve;
+                        script.onerror = reject;
+                        document.head.appendChild(script);
+                    });
+                });
+            }, Promise.resolve()).then(function() {
+                return parseGeoraster(new URL(CONFIG.cogUrl, window.location.href).href);
+            }).then(function(georaster) {
+                const cogLayer = new GeoRasterLayer({
+                    georaster: georaster,
+                    attribution: 'Orthomosaic © Drone Mapping',
+                    resolution: 256,
+                    opacity: 1.0
+                });
+                orthomosaicLayer.addLayer(cogLayer);
+                initialBounds = cogLayer.getBounds();
+                map.fitBounds(initialBounds);
+            });
+        } else {
+            // Paint each tile into a canvas instead of keeping an <img> in the
+            // DOM: tiles never enter layout/style recalculation and the GPU composites
+            // one bitmap per tile with no sub-pixel seams between neighbours.
+            // Only drawImage is used, so cross-origin tiles never taint reads.
+            const CanvasTileLayer = L.TileLayer.extend({
+                createTile: function(coords, done) {
+                    const size = this.getTileSize();
+                    const tile = document.createElement('canvas');
+                    tile.width = size.x;
+                    tile.height = size.y;
+
+                    const img = new Image();
+                    img.decoding = 'async';
+                    img.fetchPriority = coords.z === Math.round(this._map.getZoom()) ? 'high' : 'low';
+                    img.onload = function() {
+                        tile.getContext('2d').drawImage(img, 0, 0, size.x, size.y);
+                        tile.complete = true;
+                        done(null, tile);
+                    };
+                    img.onerror = function(err) {
+                        tile.complete = true;
+                        done(err, tile);
+                    };
+                    img.src = this.getTileUrl(coords);
+                    return tile;
+                }
+            });
+            orthomosaicLayer = new CanvasTileLayer(CONFIG.tileUrl, {
+                attribution: 'Orthomosaic © Drone Mapping',
+                maxZoom: 22,
+                tms: false,  // XYZ tile scheme (not TMS)
+                keepBuffer: 4,
+                opacity: 1.0
+            }).addTo(map);
+        }